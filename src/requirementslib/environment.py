@@ -14,4 +14,6 @@ def is_type_checking():
 REQUIREMENTSLIB_CACHE_DIR = os.getenv(
     "REQUIREMENTSLIB_CACHE_DIR", user_cache_dir("pipenv")
 )
+# Persisting resolved dependencies is opt-in, they stay in memory when unset
+REQUIREMENTSLIB_DEPENDENCY_CACHE_DIR = os.getenv("REQUIREMENTSLIB_DEPENDENCY_CACHE_DIR")
 MYPY_RUNNING = os.environ.get("MYPY_RUNNING", is_type_checking())
@@ -1,8 +1,11 @@
 import atexit
+import contextlib
 import copy
 import hashlib
 import json
 import os
+import sys
+import threading
 
 import vistir
 from pip._internal.utils.hashes import FAVORITE_HASH
@@ -17,11 +20,32 @@ CACHE_DIR = os.environ.get("PIPENV_CACHE_DIR", user_cache_dir("pipenv"))
 
 
 class DependencyCache(object):
-    """Creates a new in memory dependency cache for the current Python
-    version."""
+    """Creates a new dependency cache for the current Python version.
 
-    def __init__(self):
-        self.cache = {}
+    The cache lives in memory unless a **cache_dir** is supplied, in which
+    case it is loaded from and written back to a JSON file in that directory.
+    Writes can be deferred with :meth:`batch`, which resolvers should wrap
+    around a whole resolve.
+    """
+
+    def __init__(self, cache_dir=None):
+        self._cache_file = None
+        if cache_dir is not None:
+            py_version = ".".join(str(digit) for digit in sys.version_info[:2])
+            # Prefixed so it can't clash with pip-tools' depcache in a shared directory
+            cache_filename = "reqlib-depcache-py{}.json".format(py_version)
+            self._cache_file = os.path.join(cache_dir, cache_filename)
+        self._cache = None
+        self._batch_depth = 0
+        self._batch_lock = threading.Lock()
+        self._dirty = False
+
+    @property
+    def cache(self):
+        """The cache contents, loaded from disk on first access."""
+        if self._cache is None:
+            self.read_cache()
+        return self._cache
 
     def as_cache_key(self, ireq):
         """Given a requirement, return its cache key. This behavior is a little
@@ -42,17 +66,63 @@ class DependencyCache(object):
             extras_string = "[{}]".format(",".join(extras))
         return name, "{}{}".format(version, extras_string)
 
+    def read_cache(self):
+        """Reads the cached contents into memory."""
+        self._cache = {}
+        if self._cache_file is None or not os.path.exists(self._cache_file):
+            return
+        try:
+            with open(self._cache_file) as f:
+                doc = json.load(f)
+        except (OSError, ValueError):
+            return
+        if doc.get("__format__") == 1:
+            self._cache = doc.get("dependencies", {})
+
     def write_cache(self):
         """Writes the cache to disk as JSON."""
+        self._dirty = False
+        if self._cache_file is None:
+            return
         doc = {
             "__format__": 1,
-            "dependencies": self._cache,
+            "dependencies": self.cache,
         }
+        os.makedirs(os.path.dirname(self._cache_file), exist_ok=True)
         with open(self._cache_file, "w") as f:
             json.dump(doc, f, sort_keys=True)
 
+    def flush(self):
+        """Writes any pending changes to disk."""
+        if self._dirty:
+            self.write_cache()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Defers writing the cache to disk until the outermost batch exits."""
+        if self._cache_file is None:
+            # Nothing is ever written, so there is nothing to defer
+            yield self
+            return
+        with self._batch_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._batch_lock:
+                self._batch_depth -= 1
+                outermost = not self._batch_depth
+            if outermost:
+                self.flush()
+
+    def _changed(self):
+        self._dirty = True
+        if not self._batch_depth:
+            self.write_cache()
+
     def clear(self):
         self._cache = {}
+        self._changed()
 
     def __contains__(self, ireq):
         pkgname, pkgversion_and_extras = self.as_cache_key(ireq)
@@ -66,6 +136,7 @@ class DependencyCache(object):
         pkgname, pkgversion_and_extras = self.as_cache_key(ireq)
         self.cache.setdefault(pkgname, {})
         self.cache[pkgname][pkgversion_and_extras] = values
+        self._changed()
 
     def __delitem__(self, ireq):
         pkgname, pkgversion_and_extras = self.as_cache_key(ireq)
@@ -73,6 +144,7 @@ class DependencyCache(object):
             del self.cache[pkgname][pkgversion_and_extras]
         except KeyError:
             return
+        self._changed()
 
     def get(self, ireq, default=None):
         pkgname, pkgversion_and_extras = self.as_cache_key(ireq)
@@ -1,8 +1,13 @@
 import atexit
+import collections
 import contextlib
 import copy
 import functools
+import operator
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.parser import HeaderParser
 from json import JSONDecodeError
 
 import attr
@@ -14,20 +19,22 @@ from pip._internal.req.constructors import install_req_from_line
 from pip._internal.req.req_install import InstallRequirement
 from pip._internal.req.req_set import RequirementSet
 from pip._internal.utils.temp_dir import TempDirectory, global_tempdir_manager
-from pip._vendor.packaging.markers import Marker
+from pip._vendor.packaging.markers import Marker, Variable
+from pip._vendor.packaging.specifiers import SpecifierSet
 from pip._vendor.packaging.utils import canonicalize_name
-from pip._vendor.packaging.version import parse
+from pip._vendor.packaging.version import InvalidVersion, parse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from vistir.contextmanagers import temp_environ
 from vistir.path import create_tracked_tempdir
 
-from ..environment import MYPY_RUNNING
+from ..environment import MYPY_RUNNING, REQUIREMENTSLIB_DEPENDENCY_CACHE_DIR
 from ..utils import get_package_finder, get_pip_command, prepare_pip_source_args
 from .cache import CACHE_DIR, DependencyCache
 from .setup_info import SetupInfo
 from .utils import (
     clean_requires_python,
     format_requirement,
-    full_groupby,
     is_pinned_requirement,
     key_from_ireq,
     make_install_requirement,
@@ -36,12 +43,24 @@ from .utils import (
 )
 
 if MYPY_RUNNING:
-    from typing import Any, Dict, List, Optional, Set, Text, TypeVar, Union
+    from typing import (
+        Any,
+        Dict,
+        FrozenSet,
+        List,
+        Optional,
+        Set,
+        Text,
+        Tuple,
+        TypeVar,
+        Union,
+    )
 
     from pip._internal.commands import Command
     from pip._internal.index.package_finder import PackageFinder
     from pip._internal.models.candidate import InstallationCandidate
     from pip._vendor.packaging.requirements import Requirement as PackagingRequirement
+    from pip._vendor.packaging.version import Version
 
     TRequirement = TypeVar("TRequirement")
     RequirementType = TypeVar(
@@ -55,7 +74,32 @@ if MYPY_RUNNING:
 PKGS_DOWNLOAD_DIR = os.path.join(CACHE_DIR, "pkgs")
 WHEEL_DOWNLOAD_DIR = os.path.join(CACHE_DIR, "wheels")
 
-DEPENDENCY_CACHE = DependencyCache()
+DEPENDENCY_CACHE = DependencyCache(REQUIREMENTSLIB_DEPENDENCY_CACHE_DIR)
+atexit.register(DEPENDENCY_CACHE.flush)
+#: Guards the module-level caches, which may be written to from worker threads
+_CACHE_LOCK = threading.Lock()
+
+#: Shared session for PyPI API requests, created on first use
+_PYPI_SESSION = None
+
+#: Recent JSON API ``info`` payloads keyed by URL, stored as ``(etag, info)``
+_JSON_API_RESPONSES = collections.OrderedDict()
+_JSON_API_RESPONSES_MAXSIZE = 256
+
+#: Version strings are parsed over and over while comparing candidates
+_parse_version = functools.lru_cache(maxsize=4096)(parse)
+
+#: Per-project maps of wheel version to core metadata URL from the simple index
+_SIMPLE_INDEX_METADATA_URLS = {}
+
+#: (source, requirement) pairs already known to have no dependency information
+_NEGATIVE_CACHE = set()
+
+#: Only these statuses mean a resource is really missing; others may be transient
+_MISSING_STATUS_CODES = frozenset((404, 410))
+
+#: Abstract dependencies keyed by (name, specifiers, extras, markers, constraint)
+_ABSTRACT_DEP_CACHE = {}
 
 
 @contextlib.contextmanager
@@ -64,8 +108,10 @@ def _get_wheel_cache():
         yield WheelCache(CACHE_DIR, FormatControl(set(), set()))
 
 
-def _get_filtered_versions(ireq, versions, prereleases):
-    return set(ireq.specifier.filter(versions, prereleases=prereleases))
+@functools.lru_cache(maxsize=1024)
+def _get_filtered_versions(specifier, versions, prereleases):
+    # type: (S, FrozenSet[Version], bool) -> FrozenSet[Version]
+    return frozenset(SpecifierSet(specifier).filter(versions, prereleases=prereleases))
 
 
 def find_all_matches(finder, ireq, pre=False):
@@ -82,24 +128,52 @@ def find_all_matches(finder, ireq, pre=False):
     """
 
     candidates = clean_requires_python(finder.find_all_candidates(ireq.name))
-    versions = {candidate.version for candidate in candidates}
-    allowed_versions = _get_filtered_versions(ireq, versions, pre)
+    versions = frozenset(candidate.version for candidate in candidates)
+    specifier = str(ireq.specifier)
+    allowed_versions = _get_filtered_versions(specifier, versions, pre)
     if not pre and not allowed_versions:
-        allowed_versions = _get_filtered_versions(ireq, versions, True)
+        allowed_versions = _get_filtered_versions(specifier, versions, True)
     candidates = {c for c in candidates if c.version in allowed_versions}
     return candidates
 
 
-@attr.s
+@attr.s(slots=True, eq=False)
 class AbstractDependency(object):
     name = attr.ib()  # type: STRING_TYPE
     specifiers = attr.ib()
     markers = attr.ib()
-    candidates = attr.ib()
+    _candidates = attr.ib()  # type: List[InstallRequirement]
     requirement = attr.ib()
     parent = attr.ib()
     finder = attr.ib()
-    dep_dict = attr.ib(default=attr.Factory(dict))
+    #: The dependencies of each candidate, indexed by candidate position
+    dep_dict = attr.ib(default=None)  # type: List[Optional[List[AbstractDependency]]]
+    #: The parsed version of each candidate, indexed by candidate position
+    _candidate_versions = attr.ib(init=False, factory=list)  # type: List[Version]
+    _version_set = attr.ib(init=False, default=frozenset())  # type: FrozenSet[Version]
+    #: Whether the only candidate is an editable requirement
+    _editable_singleton = attr.ib(init=False, default=False)  # type: bool
+
+    def __attrs_post_init__(self):
+        if self.dep_dict is None:
+            self.dep_dict = [None] * len(self._candidates)
+        if len(self._candidates) > 1:
+            self._candidate_versions = [
+                _parse_version(version_from_ireq(c)) for c in self._candidates
+            ]
+            self._version_set = frozenset(self._candidate_versions)
+        elif self._candidates:
+            self._editable_singleton = bool(self._candidates[0].editable)
+
+    @classmethod
+    def clear_cache(cls):
+        """Discard all memoized results of :meth:`from_requirement`."""
+        _ABSTRACT_DEP_CACHE.clear()
+
+    @property
+    def candidates(self):
+        # type: () -> List[InstallRequirement]
+        return self._candidates
 
     @property
     def version_set(self):
@@ -107,12 +181,10 @@ class AbstractDependency(object):
         dependency.
 
         :return: A set of matching versions
-        :rtype: set(str)
+        :rtype: frozenset(str)
         """
 
-        if len(self.candidates) == 1:
-            return set()
-        return set(parse(version_from_ireq(c)) for c in self.candidates)
+        return self._version_set
 
     def compatible_versions(self, other):
         """Find compatible version numbers between this abstract dependency and
@@ -124,11 +196,11 @@ class AbstractDependency(object):
         :rtype: set(str)
         """
 
-        if len(self.candidates) == 1 and next(iter(self.candidates)).editable:
+        if self._editable_singleton:
             return self
-        elif len(other.candidates) == 1 and next(iter(other.candidates)).editable:
+        elif other._editable_singleton:
             return other
-        return self.version_set & other.version_set
+        return self._version_set & other._version_set
 
     def compatible_abstract_dep(self, other):
         """Merge this abstract dependency with another one.
@@ -143,9 +215,9 @@ class AbstractDependency(object):
 
         from .requirements import Requirement
 
-        if len(self.candidates) == 1 and next(iter(self.candidates)).editable:
+        if self._editable_singleton:
             return self
-        elif len(other.candidates) == 1 and next(iter(other.candidates)).editable:
+        elif other._editable_singleton:
             return other
         new_specifiers = self.specifiers & other.specifiers
         markers = set(self.markers) if self.markers else set()
@@ -154,31 +226,36 @@ class AbstractDependency(object):
         new_markers = None
         if markers:
             new_markers = Marker(" or ".join(str(m) for m in sorted(markers)))
-        new_ireq = copy.deepcopy(self.requirement.ireq)
+        ireq = self.requirement.ireq
+        if ireq.editable or ireq.req.url:
+            # The name and specifiers alone can't reproduce a direct reference
+            new_ireq = copy.deepcopy(ireq)
+            new_ireq.req.marker = new_markers
+        else:
+            new_ireq = make_install_requirement(
+                self.name,
+                extras=ireq.extras,
+                markers=new_markers,
+                constraint=bool(self.parent),
+            )
         new_ireq.req.specifier = new_specifiers
-        new_ireq.req.marker = new_markers
         new_requirement = Requirement.from_line(format_requirement(new_ireq))
         compatible_versions = self.compatible_versions(other)
         if isinstance(compatible_versions, AbstractDependency):
             return compatible_versions
-        candidates = [
-            c
-            for c in self.candidates
-            if parse(version_from_ireq(c)) in compatible_versions
+        kept = [
+            i
+            for i, version in enumerate(self._candidate_versions)
+            if version in compatible_versions
         ]
-        dep_dict = {}
-        candidate_strings = [format_requirement(c) for c in candidates]
-        for c in candidate_strings:
-            if c in self.dep_dict:
-                dep_dict[c] = self.dep_dict.get(c)
         return AbstractDependency(
             name=self.name,
             specifiers=new_specifiers,
             markers=new_markers,
-            candidates=candidates,
+            candidates=[self._candidates[i] for i in kept],
             requirement=new_requirement,
             parent=self.parent,
-            dep_dict=dep_dict,
+            dep_dict=[self.dep_dict[i] for i in kept],
             finder=self.finder,
         )
 
@@ -191,14 +268,20 @@ class AbstractDependency(object):
         :rtype: list[:class:`~requirementslib.models.dependency.AbstractDependency`]
         """
 
-        key = format_requirement(candidate)
-        if key not in self.dep_dict:
-            from .requirements import Requirement
+        try:
+            index = self._candidates.index(candidate)
+        except ValueError:
+            index = None
+        if index is not None and self.dep_dict[index] is not None:
+            return self.dep_dict[index]
+        from .requirements import Requirement
 
-            req = Requirement.from_line(key)
-            req = req.merge_markers(self.markers)
-            self.dep_dict[key] = req.abstract_dependencies()
-        return self.dep_dict[key]
+        req = Requirement.from_line(format_requirement(candidate))
+        req = req.merge_markers(self.markers)
+        deps = req.abstract_dependencies()
+        if index is not None:
+            self.dep_dict[index] = deps
+        return deps
 
     @classmethod
     def from_requirement(cls, requirement, parent=None):
@@ -218,27 +301,47 @@ class AbstractDependency(object):
         extras = requirement.ireq.extras
         is_pinned = is_pinned_requirement(requirement.ireq)
         is_constraint = bool(parent)
+        cache_key = None
+        if not is_pinned and not requirement.editable:
+            cache_key = (
+                name,
+                str(specifiers),
+                frozenset(extras),
+                str(markers) if markers else None,
+                is_constraint,
+            )
+            cached = _ABSTRACT_DEP_CACHE.get(cache_key)
+            if cached is not None:
+                return cached._copy_for(requirement, parent)
         _, finder = get_finder(sources=None)
         candidates = []
         if not is_pinned and not requirement.editable:
+            # Normalize these once rather than for every matching candidate
+            extras_tuple = tuple(sorted(extras)) if extras else None
+            markers_str = str(markers) if markers else None
+            # Keep one candidate per version, every file of a release matches
+            unique_candidates = {}
             for r in requirement.find_all_matches(finder=finder):
                 req = make_install_requirement(
                     name,
                     r.version,
-                    extras=extras,
-                    markers=markers,
+                    extras=extras_tuple,
+                    markers=markers_str,
                     constraint=is_constraint,
                 )
                 req.req.link = getattr(r, "location", getattr(r, "link", None))
                 req.parent = parent
-                candidates.append(req)
-                candidates = sorted(
-                    set(candidates),
-                    key=lambda k: parse(version_from_ireq(k)),
-                )
+                unique_candidates.setdefault((req.name, str(req.specifier)), req)
+            # Parse each version once instead of on every comparison
+            decorated = [
+                (_parse_version(version_from_ireq(c)), c)
+                for c in unique_candidates.values()
+            ]
+            decorated.sort(key=operator.itemgetter(0))
+            candidates = [c for _, c in decorated]
         else:
             candidates = [requirement.ireq]
-        return cls(
+        abstract_dep = cls(
             name=name,
             specifiers=specifiers,
             markers=markers,
@@ -247,6 +350,31 @@ class AbstractDependency(object):
             parent=parent,
             finder=finder,
         )
+        if cache_key is not None:
+            with _CACHE_LOCK:
+                cached = _ABSTRACT_DEP_CACHE.setdefault(cache_key, abstract_dep)
+            # Keep the cached instance away from whatever the caller mutates
+            return cached._copy_for(requirement, parent)
+        return abstract_dep
+
+    def _copy_for(self, requirement, parent):
+        """Copy a cached abstract dependency for a new caller.
+
+        Resolvers set ``parent`` on the candidates they pin, so each copy gets
+        its own shallow copies of the candidates and its own ``dep_dict``.
+        """
+        candidates = []
+        for candidate in self._candidates:
+            candidate = copy.copy(candidate)
+            candidate.parent = parent
+            candidates.append(candidate)
+        return attr.evolve(
+            self,
+            candidates=candidates,
+            requirement=requirement,
+            parent=parent,
+            dep_dict=list(self.dep_dict),
+        )
 
     @classmethod
     def from_string(cls, line, parent=None):
@@ -261,6 +389,8 @@ def get_abstract_dependencies(reqs, parent=None):
     """Get all abstract dependencies for a given list of requirements.
 
     Given a set of requirements, convert each requirement to an Abstract Dependency.
+    Candidate lookups hit the package index, so they are run concurrently and
+    the results are returned in the order of the input requirements.
 
     :param reqs: A list of Requirements
     :type reqs: list[:class:`~requirementslib.models.requirements.Requirement`]
@@ -269,9 +399,9 @@ def get_abstract_dependencies(reqs, parent=None):
     :return: A list of Abstract Dependencies
     :rtype: list[:class:`~requirementslib.models.dependency.AbstractDependency`]
     """
-    deps = []
     from .requirements import Requirement
 
+    requirements = []
     for req in reqs:
         if isinstance(req, InstallRequirement):
             requirement = Requirement.from_line("{0}{1}".format(req.name, req.specifier))
@@ -282,12 +412,31 @@ def get_abstract_dependencies(reqs, parent=None):
                 requirement.extras = req.extras
                 requirement.req.extras = req.extras
         elif isinstance(req, Requirement):
-            requirement = copy.deepcopy(req)
+            requirement = None
+            if req.is_named and not req.ireq.markers and not req.hashes and not req.index:
+                # Plain named requirements round-trip through their string form,
+                # which is far cheaper than deep-copying the whole requirement graph
+                requirement = Requirement.from_line(req.as_line(include_hashes=False))
+                # The line form normalizes the name, keep the one we were given
+                if requirement.name != req.name:
+                    requirement = None
+            if requirement is None:
+                requirement = copy.deepcopy(req)
         else:
             requirement = Requirement.from_line(req)
-        dep = AbstractDependency.from_requirement(requirement, parent=parent)
-        deps.append(dep)
-    return deps
+        requirements.append(requirement)
+    with DEPENDENCY_CACHE.batch():
+        if len(requirements) < 2:
+            return [
+                AbstractDependency.from_requirement(requirement, parent=parent)
+                for requirement in requirements
+            ]
+        with ThreadPoolExecutor(max_workers=min(32, len(requirements))) as executor:
+            futures = [
+                executor.submit(AbstractDependency.from_requirement, requirement, parent)
+                for requirement in requirements
+            ]
+            return [future.result() for future in futures]
 
 
 def get_dependencies(ireq, sources=None, parent=None):
@@ -310,16 +459,19 @@ def get_dependencies(ireq, sources=None, parent=None):
             ireq = install_req_from_line("{0}".format(name))
         else:
             ireq = install_req_from_line("{0}=={1}".format(name, version))
-    getters = [
-        get_dependencies_from_cache,
-        get_dependencies_from_wheel_cache,
-        get_dependencies_from_json,
-        functools.partial(get_dependencies_from_index, sources=sources),
-    ]
-    for getter in getters:
-        deps = getter(ireq)
-        if deps is not None:
-            return deps
+    # Try each source in turn, cheapest first
+    with DEPENDENCY_CACHE.batch():
+        deps = get_dependencies_from_cache(ireq)
+        if deps is None:
+            deps = get_dependencies_from_wheel_cache(ireq)
+        if deps is None:
+            deps = get_dependencies_from_simple_index(ireq)
+        if deps is None:
+            deps = get_dependencies_from_json(ireq)
+        if deps is None:
+            deps = get_dependencies_from_index(ireq, sources=sources)
+    if deps is not None:
+        return deps
     raise RuntimeError("failed to get dependencies for {}".format(ireq))
 
 
@@ -336,19 +488,176 @@ def get_dependencies_from_wheel_cache(ireq):
 
     if ireq.editable or not is_pinned_requirement(ireq):
         return
+    negative_key = ("wheel_cache", format_requirement(ireq))
+    if negative_key in _NEGATIVE_CACHE:
+        return None
     with _get_wheel_cache() as wheel_cache:
         matches = wheel_cache.get(ireq.link, name_from_req(ireq.req), ireq.markers)
         if matches:
             matches = set(matches)
-            if not DEPENDENCY_CACHE.get(ireq):
-                DEPENDENCY_CACHE[ireq] = [format_requirement(m) for m in matches]
+            with _CACHE_LOCK:
+                if not DEPENDENCY_CACHE.get(ireq):
+                    DEPENDENCY_CACHE[ireq] = [format_requirement(m) for m in matches]
             return matches
+        _NEGATIVE_CACHE.add(negative_key)
+        return None
+
+
+def _get_simple_index_metadata_urls(project_name):
+    """Map each wheel version of a project to the URL of its PEP 658 core
+    metadata, using a single PEP 691 request per project.
+
+    Returns None, without caching anything, when the index could not be
+    reached.
+    """
+    key = canonicalize_name(project_name)
+    metadata_urls = _SIMPLE_INDEX_METADATA_URLS.get(key)
+    if metadata_urls is not None:
+        return metadata_urls
+    metadata_urls = {}
+    response = _get_pypi_session().get(
+        "https://pypi.org/simple/{0}/".format(key),
+        headers={"Accept": "application/vnd.pypi.simple.v1+json"},
+    )
+    if response.status_code == 200:
+        for file in response.json().get("files", []):
+            filename = file.get("filename", "")
+            metadata = file.get("core-metadata", file.get("dist-info-metadata"))
+            if not metadata or not filename.endswith(".whl"):
+                continue
+            try:
+                version = _parse_version(filename.split("-")[1])
+            except (IndexError, InvalidVersion):
+                continue
+            metadata_urls.setdefault(version, "{0}.metadata".format(file["url"]))
+    elif response.status_code not in _MISSING_STATUS_CODES:
         return None
+    with _CACHE_LOCK:
+        _SIMPLE_INDEX_METADATA_URLS[key] = metadata_urls
+    return metadata_urls
+
+
+def get_dependencies_from_simple_index(ireq):
+    """Retrieves dependencies for the given install requirement from the core
+    metadata of its wheels, as listed by the PEP 691 JSON simple index.
+
+    :param ireq: A single InstallRequirement
+    :type ireq: :class:`~pip._internal.req.req_install.InstallRequirement`
+    :return: A set of dependency lines for generating new InstallRequirements.
+    :rtype: set(str) or None
+    """
+
+    if ireq.editable or not is_pinned_requirement(ireq):
+        return
+    # Same as the json api, requirements with extras are left to the index
+    if ireq.extras:
+        return
+    if ireq in DEPENDENCY_CACHE:
+        return set(DEPENDENCY_CACHE[ireq])
+    negative_key = ("simple", format_requirement(ireq))
+    if negative_key in _NEGATIVE_CACHE:
+        return
+    try:
+        metadata_urls = _get_simple_index_metadata_urls(ireq.req.name)
+        version = _parse_version(version_from_ireq(ireq))
+    except (JSONDecodeError, InvalidVersion):
+        metadata_urls, version = {}, None
+    if metadata_urls is None:
+        return
+    metadata_url = metadata_urls.get(version)
+    if metadata_url is None:
+        _NEGATIVE_CACHE.add(negative_key)
+        return
+    response = _get_pypi_session().get(metadata_url, headers={"Accept": "*/*"})
+    if response.status_code != 200:
+        if response.status_code in _MISSING_STATUS_CODES:
+            _NEGATIVE_CACHE.add(negative_key)
+        return
+    metadata = HeaderParser().parsestr(response.text)
+    reqs = []
+    for requires in metadata.get_all("Requires-Dist") or []:
+        i = install_req_from_line(requires)
+        # See get_dependencies_from_json, we don't handle requirements with extras.
+        if not _marker_contains_extra(i):
+            reqs.append(format_requirement(i))
+    with _CACHE_LOCK:
+        DEPENDENCY_CACHE[ireq] = reqs
+    return set(reqs)
+
+
+def _has_extra_marker(markers):
+    # type: (List[Any]) -> bool
+    for marker in markers:
+        if isinstance(marker, list):
+            if _has_extra_marker(marker):
+                return True
+        elif isinstance(marker, tuple):
+            lhs, _, rhs = marker
+            if any(
+                isinstance(node, Variable) and node.value == "extra"
+                for node in (lhs, rhs)
+            ):
+                return True
+    return False
 
 
 def _marker_contains_extra(ireq):
-    # TODO: Implement better parsing logic avoid false-positives.
-    return "extra" in repr(ireq.markers)
+    return ireq.markers is not None and _has_extra_marker(ireq.markers._markers)
+
+
+def _get_pypi_session():
+    # type: () -> requests.Session
+    global _PYPI_SESSION
+    if _PYPI_SESSION is None:
+        with _CACHE_LOCK:
+            if _PYPI_SESSION is None:
+                session = requests.Session()
+                session.mount(
+                    "https://",
+                    HTTPAdapter(
+                        pool_connections=16,
+                        pool_maxsize=32,
+                        max_retries=Retry(total=3, backoff_factor=0.2),
+                    ),
+                )
+                session.headers["Accept"] = "application/json"
+                atexit.register(session.close)
+                _PYPI_SESSION = session
+    return _PYPI_SESSION
+
+
+def _get_json_api_info(session, url):
+    """Fetch the ``info`` section of a JSON API response, revalidating any
+    previously seen response with its ETag so unchanged payloads are not
+    downloaded again.
+
+    The response is streamed so that the body is only read when there is
+    something to parse. Returns an ``(info, status_code)`` tuple, where
+    ``info`` is None if the request failed.
+    """
+    cached = _JSON_API_RESPONSES.get(url)
+    headers = {"If-None-Match": cached[0]} if cached is not None else None
+    response = session.get(url, headers=headers, stream=True)
+    if cached is not None and response.status_code == 304:
+        response.close()
+        with _CACHE_LOCK:
+            if url in _JSON_API_RESPONSES:
+                _JSON_API_RESPONSES.move_to_end(url)
+        return cached[1], response.status_code
+    if response.status_code != 200:
+        response.close()
+        return None, response.status_code
+    info = response.json().get("info")
+    if info is None:
+        return None, response.status_code
+    etag = response.headers.get("ETag")
+    if etag:
+        with _CACHE_LOCK:
+            _JSON_API_RESPONSES[url] = (etag, info)
+            _JSON_API_RESPONSES.move_to_end(url)
+            while len(_JSON_API_RESPONSES) > _JSON_API_RESPONSES_MAXSIZE:
+                _JSON_API_RESPONSES.popitem(last=False)
+    return info, response.status_code
 
 
 def get_dependencies_from_json(ireq):
@@ -368,19 +677,14 @@ def get_dependencies_from_json(ireq):
     # requirement format, but it is such a chore let's just use the simple API.
     if ireq.extras:
         return
+    negative_key = ("json", format_requirement(ireq))
+    if negative_key in _NEGATIVE_CACHE:
+        return
 
-    session = requests.session()
-    atexit.register(session.close)
+    session = _get_pypi_session()
     version = str(ireq.req.specifier).lstrip("=")
 
-    def gen(ireq):
-        info = None
-        try:
-            info = session.get(
-                "https://pypi.org/pypi/{0}/{1}/json".format(ireq.req.name, version)
-            ).json()["info"]
-        finally:
-            session.close()
+    def gen(info):
         requires_dist = info.get("requires_dist", info.get("requires"))
         if not requires_dist:  # The API can return None for this.
             return
@@ -390,15 +694,22 @@ def get_dependencies_from_json(ireq):
             if not _marker_contains_extra(i):
                 yield format_requirement(i)
 
-    if ireq not in DEPENDENCY_CACHE:
-        try:
-            reqs = DEPENDENCY_CACHE[ireq] = list(gen(ireq))
-        except JSONDecodeError:
-            return
-        req_iter = iter(reqs)
-    else:
-        req_iter = gen(ireq)
-    return set(req_iter)
+    if ireq in DEPENDENCY_CACHE:
+        return set(DEPENDENCY_CACHE[ireq])
+    try:
+        info, status_code = _get_json_api_info(
+            session, "https://pypi.org/pypi/{0}/{1}/json".format(ireq.req.name, version)
+        )
+    except JSONDecodeError:
+        info, status_code = None, None
+    if info is None:
+        if status_code in _MISSING_STATUS_CODES:
+            _NEGATIVE_CACHE.add(negative_key)
+        return
+    reqs = list(gen(info))
+    with _CACHE_LOCK:
+        DEPENDENCY_CACHE[ireq] = reqs
+    return set(reqs)
 
 
 def get_dependencies_from_cache(ireq):
@@ -433,7 +744,8 @@ def get_dependencies_from_cache(ireq):
         broken = True
 
     if broken:
-        del DEPENDENCY_CACHE[ireq]
+        with _CACHE_LOCK:
+            del DEPENDENCY_CACHE[ireq]
         return
 
     return cached
@@ -538,13 +850,48 @@ def get_dependencies_from_index(dep, sources=None, pip_options=None, wheel_cache
             requirements = [v for v in results.values() if v.name != dep.name]
         requirements = set([format_requirement(r) for r in requirements])
     if not dep.editable and is_pinned_requirement(dep) and requirements is not None:
-        DEPENDENCY_CACHE[dep] = list(requirements)
+        with _CACHE_LOCK:
+            DEPENDENCY_CACHE[dep] = list(requirements)
     return requirements
 
 
+DEFAULT_SOURCES = (("https://pypi.org/simple", "pypi", True),)
+
+
+def _sources_key(sources):
+    # type: (Optional[List[Dict[S, Union[S, bool]]]]) -> Tuple[Tuple[S, S, bool], ...]
+    """Convert a list of pipfile-formatted sources into a hashable cache key."""
+    if not sources:
+        return DEFAULT_SOURCES
+    return tuple(
+        (source["url"], source.get("name"), source.get("verify_ssl", True))
+        for source in sources
+    )
+
+
+def _sources_from_key(sources_key):
+    # type: (Tuple[Tuple[S, S, bool], ...]) -> List[Dict[S, Union[S, bool]]]
+    return [
+        {"url": url, "name": name, "verify_ssl": verify_ssl}
+        for url, name, verify_ssl in sources_key
+    ]
+
+
+@functools.lru_cache(maxsize=32)
+def _get_pip_options(args, sources_key, pip_command):
+    os.makedirs(CACHE_DIR, mode=0o777, exist_ok=True)
+    pip_args = prepare_pip_source_args(_sources_from_key(sources_key), list(args))
+    pip_options, _ = pip_command.parser.parse_args(pip_args)
+    pip_options.cache_dir = CACHE_DIR
+    return pip_options
+
+
 def get_pip_options(args=None, sources=None, pip_command=None):
     """Build a pip command from a list of sources.
 
+    Results are cached on the supplied arguments, sources and pip command, so
+    callers which need to modify the returned options should copy them first.
+
     :param args: positional arguments passed through to the pip parser
     :param sources: A list of pipfile-formatted sources, defaults to None
     :param sources: list[dict], optional
@@ -556,20 +903,29 @@ def get_pip_options(args=None, sources=None, pip_command=None):
 
     if not pip_command:
         pip_command = get_pip_command()
-    if not sources:
-        sources = [{"url": "https://pypi.org/simple", "name": "pypi", "verify_ssl": True}]
-    os.makedirs(CACHE_DIR, mode=0o777, exist_ok=True)
-    pip_args = args or []
-    pip_args = prepare_pip_source_args(sources, pip_args)
-    pip_options, _ = pip_command.parser.parse_args(pip_args)
-    pip_options.cache_dir = CACHE_DIR
-    return pip_options
+    return _get_pip_options(tuple(args or ()), _sources_key(sources), pip_command)
+
+
+def _build_finder(pip_command, pip_options):
+    session = pip_command._build_session(pip_options)
+    atexit.register(session.close)
+    finder = get_package_finder(pip_command, options=pip_options, session=session)
+    return session, finder
+
+
+@functools.lru_cache(maxsize=32)
+def _get_finder(sources_key, pip_command):
+    pip_options = _get_pip_options((), sources_key, pip_command)
+    return _build_finder(pip_command, pip_options)
 
 
 def get_finder(sources=None, pip_command=None, pip_options=None):
     # type: (List[Dict[S, Union[S, bool]]], Optional[Command], Any) -> PackageFinder
     """Get a package finder for looking up candidates to install.
 
+    Finders built from the default options are cached on the supplied sources
+    and pip command; use :func:`get_finder.cache_clear` to discard them.
+
     :param sources: A list of pipfile-formatted sources, defaults to None
     :param sources: list[dict], optional
     :param pip_command: A pip command instance, defaults to None
@@ -582,14 +938,19 @@ def get_finder(sources=None, pip_command=None, pip_options=None):
 
     if not pip_command:
         pip_command = get_pip_command()
-    if not sources:
-        sources = [{"url": "https://pypi.org/simple", "name": "pypi", "verify_ssl": True}]
-    if not pip_options:
-        pip_options = get_pip_options(sources=sources, pip_command=pip_command)
-    session = pip_command._build_session(pip_options)
-    atexit.register(session.close)
-    finder = get_package_finder(get_pip_command(), options=pip_options, session=session)
-    return session, finder
+    if pip_options:
+        # Parsed pip options are not hashable, so they can't be part of the key
+        return _build_finder(pip_command, pip_options)
+    return _get_finder(_sources_key(sources), pip_command)
+
+
+def _clear_finder_caches():
+    _get_finder.cache_clear()
+    _get_pip_options.cache_clear()
+    get_pip_command.cache_clear()
+
+
+get_finder.cache_clear = _clear_finder_caches
 
 
 @contextlib.contextmanager
@@ -606,7 +967,8 @@ def start_resolver(finder=None, session=None, wheel_cache=None):
     """
 
     pip_command = get_pip_command()
-    pip_options = get_pip_options(pip_command=pip_command)
+    # The cached options are shared, copy them before setting ``src_dir``
+    pip_options = copy.copy(get_pip_options(pip_command=pip_command))
     session = None
     if not finder:
         session, finder = get_finder(pip_command=pip_command, pip_options=pip_options)
@@ -655,15 +1017,32 @@ def get_grouped_dependencies(constraints):
     # in order to resolve any conflicts when we are deciding which thing to backtrack on
     # then we take the loose match (which _is_ flexible) and start moving backwards in
     # versions by popping them off of a stack and checking for the conflicting package
-    for _, ireqs in full_groupby(constraints, key=key_from_ireq):
-        ireqs = sorted(ireqs, key=lambda ireq: ireq.editable)
-        editable_ireq = next(iter(ireq for ireq in ireqs if ireq.editable), None)
-        if editable_ireq:
-            yield editable_ireq  # only the editable match mattters, ignore all others
+    groups = collections.defaultdict(list)
+    editable_ireqs = {}
+    for constraint in constraints:
+        key = key_from_ireq(constraint)
+        if key in editable_ireqs:
+            continue
+        if constraint.editable:
+            # only the editable match mattters, ignore all others
+            editable_ireqs[key] = constraint
+        groups[key].append(constraint)
+    for key, ireqs in groups.items():
+        editable_ireq = editable_ireqs.get(key)
+        if editable_ireq is not None:
+            yield editable_ireq
             continue
         ireqs = iter(ireqs)
-        # deepcopy the accumulator so as to not modify the self.our_constraints invariant
-        combined_ireq = copy.deepcopy(next(ireqs))
+        # copy the accumulator so as to not modify the self.our_constraints invariant,
+        # only the attributes modified below need copies of their own
+        first_ireq = next(ireqs)
+        combined_ireq = copy.copy(first_ireq)
+        if first_ireq.req is not None:
+            combined_ireq.req = copy.copy(first_ireq.req)
+            combined_ireq.req.specifier = copy.copy(first_ireq.req.specifier)
+        if first_ireq.markers is not None:
+            combined_ireq.markers = copy.copy(first_ireq.markers)
+        extras = set(first_ireq.extras)
         for ireq in ireqs:
             # NOTE we may be losing some info on dropped reqs here
             try:
@@ -673,7 +1052,7 @@ def get_grouped_dependencies(constraints):
                     combined_ireq.req.specifier._specs = ireq.req.specifier._specs
             combined_ireq.constraint &= ireq.constraint
             if not combined_ireq.markers:
-                combined_ireq.markers = ireq.markers
+                combined_ireq.markers = copy.copy(ireq.markers)
             else:
                 _markers = combined_ireq.markers._markers
                 if not isinstance(_markers[0], (tuple, list)):
@@ -682,8 +1061,7 @@ def get_grouped_dependencies(constraints):
                         "and",
                         ireq.markers._markers,
                     ]
-            # Return a sorted, de-duped tuple of extras
-            combined_ireq.extras = tuple(
-                sorted(set(tuple(combined_ireq.extras) + tuple(ireq.extras)))
-            )
+            extras.update(ireq.extras)
+        # Return a sorted, de-duped tuple of extras
+        combined_ireq.extras = tuple(sorted(extras))
         yield combined_ireq
@@ -141,11 +141,18 @@ class DependencyResolver(object):
         if not self.hash_cache:
             self.hash_cache = HashCache()
 
-        # Coerce input into AbstractDependency instances.
-        # We accept str, Requirement, and AbstractDependency as input.
+        from .dependencies import DEPENDENCY_CACHE
+
+        # Every round hits the dependency cache; write it out once at the end
+        with DEPENDENCY_CACHE.batch():
+            self._resolve(root_nodes, max_rounds)
+
+    def _resolve(self, root_nodes, max_rounds):
         from ..utils import log
         from .dependencies import AbstractDependency
 
+        # Coerce input into AbstractDependency instances.
+        # We accept str, Requirement, and AbstractDependency as input.
         for dep in root_nodes:
             if isinstance(dep, str):
                 dep = AbstractDependency.from_string(dep)
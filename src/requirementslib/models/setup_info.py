@@ -1,12 +1,17 @@
 import ast
 import atexit
-import configparser
 import contextlib
+import hashlib
 import os
+import re
 import shutil
 import subprocess as sp
 import sys
+import sysconfig
+import tempfile
+from collections import deque
 from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import ExitStack
 from functools import lru_cache
 from os import scandir
@@ -18,17 +23,15 @@ import attr
 from distlib.wheel import Wheel
 from pep517 import envbuild, wrappers
 from pip._internal.network.download import Downloader
+from pip._internal.req.constructors import (
+    install_req_from_editable,
+    install_req_from_line,
+)
 from pip._internal.utils.temp_dir import global_tempdir_manager
 from pip._internal.utils.urls import url_to_path
 from pip._vendor.packaging.markers import Marker
 from pip._vendor.packaging.specifiers import SpecifierSet
 from pip._vendor.packaging.version import parse
-from pip._vendor.pkg_resources import (
-    PathMetadata,
-    Requirement,
-    distributions_from_metadata,
-    find_distributions,
-)
 from platformdirs import user_cache_dir
 from vistir.contextmanagers import cd, temp_path
 from vistir.path import create_tracked_tempdir, rmtree
@@ -39,7 +42,6 @@ from ..utils import get_pip_command
 from .old_pip_utils import old_unpack_url
 from .utils import (
     get_default_pyproject_backend,
-    get_name_variants,
     get_pyproject,
     init_requirement,
     split_vcs_method_from_uri,
@@ -80,6 +82,51 @@ if MYPY_RUNNING:
 
 
 CACHE_DIR = os.environ.get("PIPENV_CACHE_DIR", user_cache_dir("pipenv"))
+_DOWNLOAD_DIR = os.path.join(CACHE_DIR, "pkgs")
+_WHEEL_DOWNLOAD_DIR = os.path.join(CACHE_DIR, "wheels")
+
+# Populated SetupInfo instances keyed by :func:`_get_setup_info_cache_key`
+_SETUP_INFO_CACHE = {}  # type: Dict[Tuple, SetupInfo]
+# Parsed setup.cfg contents keyed by (path, st_mtime_ns, st_size)
+_SETUP_CFG_CACHE = {}  # type: Dict[Tuple[str, int, int], Dict[S, Any]]
+# BaseRequirement instances keyed by the requirement line they were parsed from
+_REQ_CACHE = {}  # type: Dict[str, BaseRequirement]
+# Compiled setup.py code objects keyed by (path, st_mtime_ns, st_size)
+_SETUP_CODE_CACHE = {}  # type: Dict[Tuple[str, int, int], Any]
+# Non-empty metadata dictionaries keyed by (path, pkg_name, metadata_type)
+_METADATA_CACHE = {}  # type: Dict[Tuple[str, Optional[str], Optional[str]], Dict[S, Any]]
+# Build requirements and backend keyed by the (path, st_mtime_ns, st_size) of pyproject.toml
+_PYPROJECT_CACHE = {}  # type: Dict[Tuple[str, int, int], Optional[Tuple[List[S], S]]]
+
+# Directories which never hold a project's metadata and aren't worth descending into
+_METADATA_SKIP_DIRS = frozenset(
+    ("node_modules", "__pycache__", "tests", "test", "docs", "build", "dist")
+)
+
+_METADATA_NAME_SEP_RE = re.compile(r"[-_.]+")
+
+_SETUP_CFG_SECTION_RE = re.compile(r"^\[(?P<name>[^\]]+)\]")
+_SETUP_CFG_OPTION_RE = re.compile(r"^(?P<key>[^=:\s][^=:]*?)\s*[=:]\s*(?P<value>.*)$")
+# Non-blank lines of a multi-line requirements option, without surrounding whitespace
+_DEP_LINE_RE = re.compile(r"^[ \t]*(\S.*?)[ \t]*$", re.M)
+
+# (key, backing field) pairs emitted by SetupInfo.as_dict, in order
+_AS_DICT_FIELDS = (
+    ("name", None),
+    ("version", "_version"),
+    ("base_dir", None),
+    ("ireq", None),
+    ("build_backend", None),
+    ("build_requires", None),
+    ("requires", "_requirements"),
+    ("setup_requires", None),
+    ("python_requires", None),
+    ("extras", "_extras_requirements"),
+    ("extra_kwargs", None),
+    ("setup_cfg", None),
+    ("setup_py", None),
+    ("pyproject", None),
+)
 
 # The following are necessary for people who like to use "if __name__" conditionals
 # in their setup.py scripts
@@ -125,8 +172,26 @@ class HookCaller(wrappers.Pep517HookCaller):
         self.backend_path = backend_path
 
 
+def _read_file_bytes(path):
+    # type: (str) -> bytes
+    """Read a whole file through the raw file descriptor, without building the
+    buffered and text layers of a :func:`open` file object."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        chunks = []
+        chunk = os.read(fd, 1 << 20)
+        while chunk:
+            chunks.append(chunk)
+            chunk = os.read(fd, 1 << 20)
+    finally:
+        os.close(fd)
+    return b"".join(chunks)
+
+
 def make_base_requirements(reqs):
     # type: (Sequence[STRING_TYPE]) -> Set[BaseRequirement]
+    from pip._vendor.pkg_resources import Requirement
+
     requirements = set()
     if not isinstance(reqs, (list, tuple, set)):
         reqs = [reqs]
@@ -185,44 +250,54 @@ class SetupReader:
         }
 
     @staticmethod
-    def read_setup_cfg(file: Path) -> "Dict[str, Any]":
-        parser = configparser.ConfigParser()
-
-        parser.read(str(file))
+    def _read_cfg_sections(file: Path) -> "Dict[str, Dict[str, str]]":
+        """Minimal INI reader for setup.cfg.
 
-        name = None
-        version = None
-        if parser.has_option("metadata", "name"):
-            name = parser.get("metadata", "name")
-
-        if parser.has_option("metadata", "version"):
-            version = parser.get("metadata", "version")
-
-        install_requires = []
-        extras_require: "Dict[str, List[str]]" = {}
-        python_requires = None
-        if parser.has_section("options"):
-            if parser.has_option("options", "install_requires"):
-                for dep in parser.get("options", "install_requires").split("\n"):
-                    dep = dep.strip()
-                    if not dep:
-                        continue
-
-                    install_requires.append(dep)
-
-            if parser.has_option("options", "python_requires"):
-                python_requires = parser.get("options", "python_requires")
+        Handles ``[section]`` headers, ``key = value`` (or ``key: value``)
+        options with indented continuation lines and full line comments,
+        which is all setuptools needs from the file.
+        """
+        try:
+            contents = _read_file_bytes(file.as_posix()).decode("utf-8")
+        except OSError:
+            return {}
 
-        if parser.has_section("options.extras_require"):
-            for group in parser.options("options.extras_require"):
-                extras_require[group] = []
-                deps = parser.get("options.extras_require", group)
-                for dep in deps.split("\n"):
-                    dep = dep.strip()
-                    if not dep:
-                        continue
+        sections: "Dict[str, Dict[str, str]]" = {}
+        section = None  # type: Optional[Dict[str, str]]
+        key = None  # type: Optional[str]
+        for line in contents.splitlines():
+            stripped = line.strip()
+            if not stripped or stripped[0] in "#;":
+                continue
+            if key is not None and line[0].isspace():
+                section[key] = "{0}\n{1}".format(section[key], stripped)
+                continue
+            key = None
+            match = _SETUP_CFG_SECTION_RE.match(line)
+            if match:
+                section = sections.setdefault(match.group("name").strip(), {})
+                continue
+            match = _SETUP_CFG_OPTION_RE.match(line)
+            if match and section is not None:
+                key = match.group("key").lower()
+                section[key] = match.group("value").strip()
+        return sections
 
-                    extras_require[group].append(dep)
+    @classmethod
+    def read_setup_cfg(cls, file: Path) -> "Dict[str, Any]":
+        sections = cls._read_cfg_sections(file)
+        metadata = sections.get("metadata", {})
+        options = sections.get("options", {})
+
+        name = metadata.get("name")
+        version = metadata.get("version")
+
+        python_requires = options.get("python_requires")
+        install_requires = _DEP_LINE_RE.findall(options.get("install_requires", ""))
+        extras_require: "Dict[str, List[str]]" = {
+            group: _DEP_LINE_RE.findall(deps)
+            for group, deps in sections.get("options.extras_require", {}).items()
+        }
 
         return {
             "name": name,
@@ -564,6 +639,8 @@ def ensure_reqs(reqs):
 
     if not isinstance(reqs, Iterable):
         raise TypeError("Expecting an Iterable, got %r" % reqs)
+    from pip._vendor.pkg_resources import Requirement
+
     new_reqs = []
     for req in reqs:
         if not req:
@@ -587,6 +664,24 @@ def any_valid_values(data: "Dict[str, Any]", fields: "Iterable[str]") -> bool:
     return fields and all(is_valid(data[field]) for field in fields)
 
 
+@lru_cache(maxsize=1)
+def _ensure_download_dirs():
+    # type: () -> None
+    os.makedirs(_DOWNLOAD_DIR, exist_ok=True)
+    os.makedirs(_WHEEL_DOWNLOAD_DIR, exist_ok=True)
+
+
+@lru_cache(maxsize=1)
+def _get_default_session():
+    # type: () -> Session
+    """The pip session used to download artifacts when no session is supplied."""
+    cmd = get_pip_command()
+    options, _ = cmd.parser.parse_args([])
+    session = cmd._build_session(options)
+    atexit.register(session.close)
+    return session
+
+
 def _prepare_wheel_building_kwargs(
     ireq=None,  # type: Optional[InstallRequirement]
     src_root=None,  # type: Optional[STRING_TYPE]
@@ -594,11 +689,7 @@ def _prepare_wheel_building_kwargs(
     editable=False,  # type: bool
 ):
     # type: (...) -> Dict[STRING_TYPE, STRING_TYPE]
-    download_dir = os.path.join(CACHE_DIR, "pkgs")  # type: STRING_TYPE
-    os.makedirs(download_dir, exist_ok=True)
-
-    wheel_download_dir = os.path.join(CACHE_DIR, "wheels")  # type: STRING_TYPE
-    os.makedirs(wheel_download_dir, exist_ok=True)
+    _ensure_download_dirs()
     if src_dir is None:
         if editable and src_root is not None:
             src_dir = src_root
@@ -615,31 +706,11 @@ def _prepare_wheel_building_kwargs(
     return {
         "build_dir": build_dir,
         "src_dir": src_dir,
-        "download_dir": download_dir,
-        "wheel_download_dir": wheel_download_dir,
+        "download_dir": _DOWNLOAD_DIR,
+        "wheel_download_dir": _WHEEL_DOWNLOAD_DIR,
     }
 
 
-class ScandirCloser(object):
-    def __init__(self, path):
-        self.iterator = scandir(path)
-
-    def __next__(self):
-        return next(iter(self.iterator))
-
-    def __iter__(self):
-        return self
-
-    def next(self):
-        return self.__next__()
-
-    def close(self):
-        if getattr(self.iterator, "close", None):
-            self.iterator.close()
-        else:
-            pass
-
-
 def _is_venv_dir(path):
     # type: (AnyStr) -> bool
     if os.name == "nt":
@@ -654,62 +725,56 @@ def _is_venv_dir(path):
 
 def iter_metadata(path, pkg_name=None, metadata_type="egg-info"):
     # type: (AnyStr, Optional[AnyStr], AnyStr) -> Generator
+    """Breadth first search for metadata directories below **path**.
+
+    When **pkg_name** is supplied, the search stops at the first match.
+    """
     if pkg_name is not None:
-        pkg_variants = get_name_variants(pkg_name)
-    dirs_to_search = [path]
+        sub = _METADATA_NAME_SEP_RE.sub
+        normalized_name = sub("_", pkg_name).lower()
+
+        def matches(entry_name):
+            # type: (str) -> bool
+            # Metadata directories are named either after the project alone or as
+            # ``{name}-{version}[-...]`` with any dashes in the name escaped
+            if sub("_", entry_name.partition("-")[0]).lower() == normalized_name:
+                return True
+            return sub("_", entry_name).lower() == normalized_name
+
+    suffix = "." + metadata_type
+    skip_dirs = _METADATA_SKIP_DIRS
+    dirs_to_search = deque([path])
     while dirs_to_search:
-        p = dirs_to_search.pop(0)
+        p = dirs_to_search.popleft()
         # Skip when the directory is like a venv
         if _is_venv_dir(p):
             continue
-        with contextlib.closing(ScandirCloser(p)) as path_iterator:
-            for entry in path_iterator:
-                if entry.is_dir():
-                    entry_name, ext = os.path.splitext(entry.name)
-                    if ext.endswith(metadata_type):
-                        if pkg_name is None or entry_name.lower() in pkg_variants:
-                            yield entry
-                    elif not entry.name.endswith(metadata_type):
-                        dirs_to_search.append(entry.path)
-
-
-def find_egginfo(target, pkg_name=None):
-    # type: (AnyStr, Optional[AnyStr]) -> Generator
-    egg_dirs = (
-        egg_dir
-        for egg_dir in iter_metadata(target, pkg_name=pkg_name)
-        if egg_dir is not None
-    )
-    if pkg_name:
-        yield next(iter(eggdir for eggdir in egg_dirs if eggdir is not None), None)
-    else:
-        for egg_dir in egg_dirs:
-            yield egg_dir
-
-
-def find_distinfo(target, pkg_name=None):
-    # type: (AnyStr, Optional[AnyStr]) -> Generator
-    dist_dirs = (
-        dist_dir
-        for dist_dir in iter_metadata(
-            target, pkg_name=pkg_name, metadata_type="dist-info"
-        )
-        if dist_dir is not None
-    )
-    if pkg_name:
-        yield next(iter(dist for dist in dist_dirs if dist is not None), None)
-    else:
-        for dist_dir in dist_dirs:
-            yield dist_dir
+        with scandir(p) as entries:
+            for entry in entries:
+                name = entry.name
+                if name[0] == "." or name in skip_dirs or not entry.is_dir():
+                    continue
+                if name.endswith(suffix):
+                    if pkg_name is None:
+                        yield entry
+                    elif matches(name[: -len(suffix)]):
+                        yield entry
+                        return
+                elif not name.endswith(metadata_type):
+                    dirs_to_search.append(entry.path)
 
 
 def get_distinfo_dist(path, pkg_name=None):
     # type: (S, Optional[S]) -> Optional[DistInfoDistribution]
 
-    dist_dir = next(iter(find_distinfo(path, pkg_name=pkg_name)), None)
+    dist_dir = next(
+        iter_metadata(path, pkg_name=pkg_name, metadata_type="dist-info"), None
+    )
     if dist_dir is not None:
         metadata_dir = dist_dir.path
         base_dir = os.path.dirname(metadata_dir)
+        from pip._vendor.pkg_resources import find_distributions
+
         dist = next(iter(find_distributions(base_dir)), None)
         if dist is not None:
             return dist
@@ -719,10 +784,12 @@ def get_distinfo_dist(path, pkg_name=None):
 def get_egginfo_dist(path, pkg_name=None):
     # type: (S, Optional[S]) -> Optional[EggInfoDistribution]
 
-    egg_dir = next(iter(find_egginfo(path, pkg_name=pkg_name)), None)
+    egg_dir = next(iter_metadata(path, pkg_name=pkg_name), None)
     if egg_dir is not None:
         metadata_dir = egg_dir.path
         base_dir = os.path.dirname(metadata_dir)
+        from pip._vendor.pkg_resources import PathMetadata, distributions_from_metadata
+
         path_metadata = PathMetadata(base_dir, metadata_dir)
         dist_iter = distributions_from_metadata(path_metadata.egg_info)
         dist = next(iter(dist_iter), None)
@@ -745,6 +812,37 @@ def get_metadata(path, pkg_name=None, metadata_type=None):
     return {}
 
 
+def _get_cached_metadata(path, pkg_name=None, metadata_type=None):
+    # type: (S, Optional[S], Optional[S]) -> Dict[S, Any]
+    """Memoized :func:`get_metadata`, only successful lookups are remembered
+    since the metadata may not have been generated yet.
+
+    Entries are never invalidated, so this is only meant for directories which
+    don't change once the metadata is there, like freshly unpacked artifacts.
+    """
+    key = (str(path), pkg_name, metadata_type)
+    metadata = _METADATA_CACHE.get(key)
+    if metadata is None:
+        metadata = get_metadata(path, pkg_name=pkg_name, metadata_type=metadata_type)
+        if metadata:
+            _METADATA_CACHE[key] = metadata
+    return metadata
+
+
+def _get_cached_pyproject(path):
+    # type: (S) -> Optional[Tuple[List[S], S]]
+    """Memoized :func:`get_pyproject`, reparsed whenever pyproject.toml changes."""
+    pyproject = os.path.join(path, "pyproject.toml")
+    try:
+        stat = os.stat(pyproject)
+    except OSError:
+        return get_pyproject(path)
+    key = (pyproject, stat.st_mtime_ns, stat.st_size)
+    if key not in _PYPROJECT_CACHE:
+        _PYPROJECT_CACHE[key] = get_pyproject(path)
+    return _PYPROJECT_CACHE[key]
+
+
 @lru_cache()
 def get_extra_name_from_marker(marker):
     # type: (MarkerType) -> Optional[S]
@@ -839,6 +937,41 @@ def ast_parse_setup_py(path: str, raising: bool = True) -> "Dict[str, Any]":
     return SetupReader.read_setup_py(Path(path), raising)
 
 
+def _compile_setup_py(path, script_name):
+    # type: (str, str) -> Any
+    """Compile the **setup.py** at **path**, reusing the code object while the
+    file is unchanged."""
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    code = _SETUP_CODE_CACHE.get(key)
+    if code is None:
+        contents = _read_file_bytes(path).replace(b"\r\n", b"\n")
+        code = _SETUP_CODE_CACHE[key] = compile(
+            contents, script_name, "exec", dont_inherit=True
+        )
+    return code
+
+
+def _list_file_names(path):
+    # type: (Path) -> Set[str]
+    try:
+        with scandir(path) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        return set()
+
+
+@contextlib.contextmanager
+def _swap_argv(argv):
+    # type: (List[str]) -> Generator[None, None, None]
+    old_argv = sys.argv
+    sys.argv = argv
+    try:
+        yield
+    finally:
+        sys.argv = old_argv
+
+
 def run_setup(script_path, egg_base=None):
     # type: (str, Optional[str]) -> Distribution
     """Run a `setup.py` script with a target **egg_base** if provided.
@@ -865,15 +998,12 @@ def run_setup(script_path, egg_base=None):
         g = {"__file__": script_name, "__name__": "__main__"}
         sys.path.insert(0, target_cwd)
 
-        save_argv = sys.argv.copy()
         try:
             global _setup_distribution, _setup_stop_after
             _setup_stop_after = "run"
-            sys.argv[0] = script_name
-            sys.argv[1:] = args
-            with open(script_name, "rb") as f:
-                contents = f.read().replace(rb"\r\n", rb"\n")
-                exec(contents, g)
+            code = _compile_setup_py(os.path.join(target_cwd, script_name), script_name)
+            with _swap_argv([script_name] + args):
+                exec(code, g)
         # We couldn't import everything needed to run setup
         except Exception:
             python = os.environ.get("PIP_PYTHON_PATH", sys.executable)
@@ -881,17 +1011,161 @@ def run_setup(script_path, egg_base=None):
             sp.run(
                 [python, "setup.py"] + args,
                 cwd=target_cwd,
-                stdout=sp.PIPE,
-                stderr=sp.PIPE,
+                stdout=sp.DEVNULL,
+                stderr=sp.DEVNULL,
+                check=False,
             )
         finally:
             _setup_stop_after = None
-            sys.argv = save_argv
             _setup_distribution = get_metadata(egg_base, metadata_type="egg")
         dist = _setup_distribution
     return dist
 
 
+def _get_egg_info_cache_dir(link, subdir=None, artifact=None):
+    # type: (Any, Optional[S], Optional[S]) -> Optional[S]
+    """Content addressed location for the egg-info generated from **link**.
+
+    The location is keyed on the hash in the link, or else on the digest of the
+    downloaded **artifact**. Returns None when neither is known, since the
+    contents behind a bare URL may change. **setup.py** may compute different
+    requirements per interpreter, so the interpreter and platform are part of
+    the key too.
+    """
+    if link.hash:
+        key = "{0}={1}".format(link.hash_name, link.hash)
+    elif artifact is not None and os.path.isfile(artifact):
+        digest = hashlib.sha256()
+        with open(artifact, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+                digest.update(chunk)
+        key = "sha256={0}".format(digest.hexdigest())
+    else:
+        return None
+    if subdir:
+        key = "{0}#subdirectory={1}".format(key, subdir)
+    key = "{0}|{1}|{2}".format(
+        key, sys.implementation.cache_tag, sysconfig.get_platform()
+    )
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, "setup_info", digest)
+
+
+def _copy_tree_atomically(src, dst, name=None):
+    # type: (S, S, Optional[S]) -> bool
+    """Copy **src** to **dst**, or to ``dst/name`` when **name** is given.
+
+    The copy is staged in a sibling directory and renamed into place, so
+    **dst** is either missing or complete, even if the copy is interrupted or
+    another process is doing the same thing.
+
+    :return: Whether **dst** was created
+    """
+    parent = os.path.dirname(dst)
+    try:
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    except OSError:
+        return False
+    try:
+        staged = os.path.join(staging, "tree")
+        shutil.copytree(src, os.path.join(staged, name) if name else staged)
+        os.rename(staged, dst)
+    except OSError:
+        return False
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return True
+
+
+def _get_setup_info_cache_key(ireq, subdir=None):
+    # type: (InstallRequirement, Optional[STRING_TYPE]) -> Tuple
+    """Key a remote artifact or VCS reference for :data:`_SETUP_INFO_CACHE`.
+
+    Extras and hashes are part of the key so a cached result is only shared
+    with install requirements that would have been built and verified the same
+    way.
+    """
+    hashes = frozenset(
+        (name, digest)
+        for name, digests in ireq.hash_options.items()
+        for digest in digests
+    )
+    return (
+        ireq.link.url_without_fragment,
+        subdir,
+        frozenset(ireq.extras),
+        ireq.link.hash_name,
+        ireq.link.hash,
+        hashes,
+    )
+
+
+def _restore_egg_info(egg_info_cache, source_dir, subdir=None):
+    # type: (S, Optional[S], Optional[S]) -> None
+    """Seed the metadata directory of a freshly unpacked artifact with the egg-info
+    stored by a previous run, see :meth:`SetupInfo.store_egg_info`."""
+    if not source_dir or not os.path.isdir(egg_info_cache):
+        return
+    # Entries are renamed into place whole, but don't trust one without PKG-INFO
+    egg_info = next(iter_metadata(egg_info_cache), None)
+    if egg_info is None or not os.path.isfile(os.path.join(egg_info.path, "PKG-INFO")):
+        return
+    setup_dir = os.path.join(source_dir, subdir) if subdir else source_dir
+    egg_base = os.path.join(setup_dir, "reqlib-metadata")
+    if os.path.exists(os.path.join(setup_dir, "setup.py")) and not os.path.exists(
+        egg_base
+    ):
+        _copy_tree_atomically(egg_info_cache, egg_base)
+
+
+def _init_setup_info_worker():
+    # type: () -> None
+    """Drop the default session a forked worker inherited from its parent.
+
+    Its pooled connections belong to the parent process, so each worker builds
+    its own session instead of sharing them.
+    """
+    _get_default_session.cache_clear()
+
+
+def _get_setup_info_dicts(chunk):
+    # type: (List[Tuple[str, bool, Tuple[str, ...], Dict[str, List[str]]]]) -> List[Optional[Dict[str, Any]]]
+    """Worker for :meth:`SetupInfo.from_ireqs`, returns picklable metadata for each
+    ``(url, editable, extras, hash_options)`` entry in **chunk**."""
+    results = []  # type: List[Optional[Dict[str, Any]]]
+    with global_tempdir_manager():
+        for url, editable, extras, hash_options in chunk:
+            if editable:
+                ireq = install_req_from_editable(url)
+                ireq.hash_options = hash_options
+            else:
+                # Keep the --hash options so downloads are verified like in-process
+                ireq = install_req_from_line(url, hash_options=hash_options)
+            ireq.extras = set(extras)
+            setup_info = SetupInfo.from_ireq(ireq, subdir=ireq.link.subdirectory_fragment)
+            if setup_info is None:
+                results.append(None)
+                continue
+            setup_info.get_info()
+            results.append(
+                {
+                    "name": setup_info.name,
+                    "version": setup_info._version,
+                    "build_backend": setup_info.build_backend,
+                    "build_requires": setup_info.build_requires,
+                    "python_requires": setup_info.python_requires,
+                    "install_requires": [str(r) for r in setup_info._requirements or ()],
+                    "setup_requires": [str(r) for r in setup_info.setup_requires or ()],
+                    "extras_require": {
+                        section: [str(r) for r in reqs]
+                        for section, reqs in setup_info._extras_requirements or ()
+                    },
+                }
+            )
+    return results
+
+
 @attr.s(slots=True, frozen=True)
 class BaseRequirement(object):
     name = attr.ib(default="", eq=True, order=True)  # type: STRING_TYPE
@@ -912,12 +1186,13 @@ class BaseRequirement(object):
         return (self.name, self.requirement)
 
     @classmethod
-    @lru_cache()
     def from_string(cls, line):
         # type: (S) -> BaseRequirement
         line = line.strip()
-        req = init_requirement(line)
-        return cls.from_req(req)
+        base_req = _REQ_CACHE.get(line)
+        if base_req is None:
+            base_req = _REQ_CACHE[line] = cls.from_req(init_requirement(line))
+        return base_req
 
     @classmethod
     @lru_cache()
@@ -980,6 +1255,10 @@ class SetupInfo(object):
     extra_kwargs = attr.ib(default=attr.Factory(dict), type=dict, eq=False, hash=False)
     metadata = attr.ib(default=None)  # type: Optional[Tuple[STRING_TYPE]]
     stack = attr.ib(default=None, eq=False)  # type: Optional[ExitStack]
+    egg_info_cache = attr.ib(default=None, eq=False, hash=False)  # type: Optional[S]
+    _has_setup_py = attr.ib(default=None, eq=False, hash=False)  # type: Optional[bool]
+    _has_setup_cfg = attr.ib(default=None, eq=False, hash=False)  # type: Optional[bool]
+    _has_pyproject = attr.ib(default=None, eq=False, hash=False)  # type: Optional[bool]
     _finalizer = attr.ib(default=None, eq=False)  # type: Any
 
     def __attrs_post_init__(self):
@@ -990,6 +1269,37 @@ class SetupInfo(object):
         # type: () -> STRING_TYPE
         return get_default_pyproject_backend()
 
+    @property
+    def has_setup_py(self):
+        # type: () -> bool
+        if self._has_setup_py is None:
+            self._has_setup_py = self.setup_py is not None and self.setup_py.exists()
+        return self._has_setup_py
+
+    @property
+    def has_setup_cfg(self):
+        # type: () -> bool
+        if self._has_setup_cfg is None:
+            self._has_setup_cfg = self.setup_cfg is not None and self.setup_cfg.exists()
+        return self._has_setup_cfg
+
+    @property
+    def has_pyproject(self):
+        # type: () -> bool
+        if self._has_pyproject is None:
+            self._has_pyproject = self.pyproject is not None and self.pyproject.exists()
+        return self._has_pyproject
+
+    @property
+    def _is_local_source(self):
+        # type: () -> bool
+        """Whether this was built from a local or editable directory, rather than
+        from an artifact or VCS checkout unpacked just for this lookup."""
+        ireq = self.ireq
+        if ireq is None or ireq.editable or ireq.link is None:
+            return True
+        return ireq.link.is_existing_dir()
+
     @property
     def requires(self):
         # type: () -> Dict[S, RequirementType]
@@ -1025,11 +1335,11 @@ class SetupInfo(object):
     def egg_base(self):
         # type: () -> S
         base = None  # type: Optional[STRING_TYPE]
-        if self.setup_py.exists():
+        if self.has_setup_py:
             base = self.setup_py.parent
-        elif self.pyproject.exists():
+        elif self.has_pyproject:
             base = self.pyproject.parent
-        elif self.setup_cfg.exists():
+        elif self.has_setup_cfg:
             base = self.setup_cfg.parent
         if base is None:
             base = Path(self.base_dir)
@@ -1102,19 +1412,26 @@ class SetupInfo(object):
 
     def parse_setup_cfg(self):
         # type: () -> Dict[STRING_TYPE, Any]
-        if self.setup_cfg is not None and self.setup_cfg.exists():
+        if self.setup_cfg is None:
+            return {}
+        path = self.setup_cfg.as_posix()
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return {}
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        parsed = _SETUP_CFG_CACHE.get(key)
+        if parsed is None:
             try:
-                parsed = setuptools_parse_setup_cfg(self.setup_cfg.as_posix())
+                parsed = setuptools_parse_setup_cfg(path)
             except Exception:
-                parsed = parse_setup_cfg(self.setup_cfg.as_posix())
-            if not parsed:
-                return {}
-            return parsed
-        return {}
+                parsed = parse_setup_cfg(path)
+            parsed = _SETUP_CFG_CACHE[key] = parsed or {}
+        return dict(parsed)
 
     def parse_setup_py(self):
         # type: () -> Dict[STRING_TYPE, Any]
-        if self.setup_py is not None and self.setup_py.exists():
+        if self.has_setup_py:
             parsed = ast_parse_setup_py(self.setup_py.as_posix())
             if not parsed:
                 return {}
@@ -1123,8 +1440,9 @@ class SetupInfo(object):
 
     def run_setup(self):
         # type: () -> "SetupInfo"
-        if self.setup_py is not None and self.setup_py.exists():
+        if self.has_setup_py:
             dist = run_setup(self.setup_py.as_posix(), egg_base=self.egg_base)
+            self.store_egg_info()
             target_cwd = self.setup_py.parent.as_posix()
             with temp_path(), cd(target_cwd):
                 if not dist:
@@ -1298,9 +1616,8 @@ build-backend = "{1}"
         :rtype: Dict[Any, Any]
         """
 
-        package_indicators = [self.pyproject, self.setup_py, self.setup_cfg]
         metadata_dirs = []  # type: List[STRING_TYPE]
-        if any([fn is not None and fn.exists() for fn in package_indicators]):
+        if self.has_pyproject or self.has_setup_py or self.has_setup_cfg:
             metadata_dirs = [
                 self.extra_kwargs["build_dir"],
                 self.egg_base,
@@ -1308,14 +1625,60 @@ build-backend = "{1}"
             ]
         if metadata_dir is not None:
             metadata_dirs = [metadata_dir] + metadata_dirs
+        # Local sources can be edited and their metadata regenerated at any time
+        lookup = get_metadata if self._is_local_source else _get_cached_metadata
         metadata = [
-            get_metadata(d, pkg_name=self.name, metadata_type=metadata_type)
+            lookup(d, pkg_name=self.name, metadata_type=metadata_type)
             for d in metadata_dirs
             if os.path.exists(d)
         ]
         metadata = next(iter(d for d in metadata if d), None)
         return metadata
 
+    def get_existing_egg_metadata(self):
+        # type: () -> Optional[Dict[Any, Any]]
+        """Read metadata from an egg-info directory which was already generated in
+        **self.egg_base**, provided it is newer than the package's setup files.
+
+        Egg-info shipped elsewhere in an sdist is never used, it was generated on
+        the maintainer's machine rather than for this interpreter.
+
+        :return: A metadata dictionary, or None if no up to date egg-info exists
+        :rtype: Optional[Dict[Any, Any]]
+        """
+
+        # Without a name any egg-info lying around would do, which may be stale
+        if self.name is None:
+            return None
+        egg_info = next(iter_metadata(self.egg_base, pkg_name=self.name), None)
+        if egg_info is None:
+            return None
+        try:
+            generated = os.stat(os.path.join(egg_info.path, "PKG-INFO")).st_mtime
+        except OSError:
+            return None
+        for setup_file, exists in (
+            (self.setup_py, self.has_setup_py),
+            (self.setup_cfg, self.has_setup_cfg),
+            (self.pyproject, self.has_pyproject),
+        ):
+            if exists and setup_file.stat().st_mtime > generated:
+                return None
+        return get_metadata(
+            os.path.dirname(egg_info.path), pkg_name=self.name, metadata_type="egg"
+        )
+
+    def store_egg_info(self):
+        # type: () -> None
+        """Copy the egg-info generated by **setup.py** into **self.egg_info_cache**
+        so later runs against the same artifact can skip it."""
+        if self.egg_info_cache is None or os.path.exists(self.egg_info_cache):
+            return
+        egg_info = next(iter_metadata(self.egg_base, pkg_name=self.name), None)
+        if egg_info is None:
+            return
+        _copy_tree_atomically(egg_info.path, self.egg_info_cache, name=egg_info.name)
+
     def populate_metadata(self, metadata):
         # type: (Dict[Any, Any]) -> "SetupInfo"
         """Populates the metadata dictionary from the supplied metadata.
@@ -1356,8 +1719,8 @@ build-backend = "{1}"
         :return: The current instance
         :rtype: `SetupInfo`
         """
-        if self.pyproject and self.pyproject.exists():
-            result = get_pyproject(self.pyproject.parent)
+        if self.has_pyproject:
+            result = _get_cached_pyproject(self.pyproject.parent.as_posix())
             if result is not None:
                 requires, backend = result
                 if self.build_requires is None:
@@ -1377,9 +1740,9 @@ build-backend = "{1}"
         parse_setupcfg = False
         parse_setuppy = False
         self.run_pyproject()
-        if self.setup_cfg and self.setup_cfg.exists():
+        if self.has_setup_cfg:
             parse_setupcfg = True
-        if self.setup_py and self.setup_py.exists():
+        if self.has_setup_py:
             parse_setuppy = True
         if (
             self.build_backend.startswith("setuptools")
@@ -1403,11 +1766,16 @@ build-backend = "{1}"
 
     def get_info(self):
         # type: () -> Dict[S, Any]
+        if self.metadata is None and self.has_setup_py:
+            metadata = self.get_existing_egg_metadata()
+            if metadata:
+                self.populate_metadata(metadata)
+
         if self.metadata is None:
             with cd(self.base_dir):
                 self.build()
 
-        if self.setup_py and self.setup_py.exists() and self.metadata is None:
+        if self.has_setup_py and self.metadata is None:
             if not self.requires or not self.name:
                 try:
                     with cd(self.base_dir):
@@ -1427,23 +1795,16 @@ build-backend = "{1}"
 
     def as_dict(self):
         # type: () -> Dict[STRING_TYPE, Any]
-        prop_dict = {
-            "name": self.name,
-            "version": self.version if self._version else None,
-            "base_dir": self.base_dir,
-            "ireq": self.ireq,
-            "build_backend": self.build_backend,
-            "build_requires": self.build_requires,
-            "requires": self.requires if self._requirements else None,
-            "setup_requires": self.setup_requires,
-            "python_requires": self.python_requires,
-            "extras": self.extras if self._extras_requirements else None,
-            "extra_kwargs": self.extra_kwargs,
-            "setup_cfg": self.setup_cfg,
-            "setup_py": self.setup_py,
-            "pyproject": self.pyproject,
-        }
-        return {k: v for k, v in prop_dict.items() if v}
+        prop_dict = {}
+        for key, source in _AS_DICT_FIELDS:
+            # ``version``, ``requires`` and ``extras`` are computed properties, only
+            # build them when the underlying field has been populated
+            if source is not None and getattr(self, source) is None:
+                continue
+            value = getattr(self, key)
+            if value is not None:
+                prop_dict[key] = value
+        return prop_dict
 
     @classmethod
     def from_requirement(cls, requirement, finder=None):
@@ -1453,18 +1814,36 @@ build-backend = "{1}"
         return cls.from_ireq(ireq, subdir=subdir, finder=finder)
 
     @classmethod
-    @lru_cache()
     def from_ireq(cls, ireq, subdir=None, finder=None, session=None):
         # type: (InstallRequirement, Optional[AnyStr], Optional[PackageFinder], Optional[Session]) -> Optional[SetupInfo]
-        if not ireq.link:
-            return None
-        if ireq.link.is_wheel:
+        # Checked ahead of the cache so wheels don't take up any of its entries
+        if ireq.link is None or ireq.link.is_wheel:
             return None
+        return cls._from_ireq(ireq, subdir=subdir, finder=finder, session=session)
+
+    @classmethod
+    @lru_cache()
+    def _from_ireq(cls, ireq, subdir=None, finder=None, session=None):
+        # type: (InstallRequirement, Optional[AnyStr], Optional[PackageFinder], Optional[Session]) -> Optional[SetupInfo]
+        # Local directories may change underneath us, so only remote artifacts and
+        # VCS references are shared between install requirements
+        cache_key = None
+        if not ireq.editable and not ireq.link.is_existing_dir():
+            cache_key = _get_setup_info_cache_key(ireq, subdir=subdir)
+            cached = _SETUP_INFO_CACHE.get(cache_key)
+            if cached is not None:
+                # Point this ireq at the source that was already unpacked
+                if not ireq.source_dir and cached.ireq is not None:
+                    ireq.source_dir = cached.ireq.source_dir
+                return attr.evolve(
+                    cached,
+                    ireq=ireq,
+                    stack=ExitStack(),
+                    extra_kwargs=dict(cached.extra_kwargs),
+                )
         stack = ExitStack()
         if not session:
-            cmd = get_pip_command()
-            options, _ = cmd.parser.parse_args([])
-            session = cmd._build_session(options)
+            session = _get_default_session()
         stack.enter_context(global_tempdir_manager())
         vcs, uri = split_vcs_method_from_uri(ireq.link.url_without_fragment)
         parsed = urlparse(uri)
@@ -1501,6 +1880,7 @@ build-backend = "{1}"
         build_location_func = getattr(ireq, "build_location", None)
         if build_location_func is None:
             build_location_func = getattr(ireq, "ensure_build_location", None)
+        downloaded = None
         if not ireq.source_dir:
             if subdir:
                 directory = f"{kwargs['build_dir']}/{subdir}"
@@ -1516,7 +1896,7 @@ build-backend = "{1}"
             location = None
             if getattr(ireq, "source_dir", None):
                 location = ireq.source_dir
-            old_unpack_url(
+            downloaded = old_unpack_url(
                 link=ireq.link,
                 location=location,
                 download=Downloader(session, "off"),
@@ -1524,11 +1904,86 @@ build-backend = "{1}"
                 download_dir=download_dir,
                 hashes=ireq.hashes(True),
             )
+        egg_info_cache = None
+        if not vcs and not is_file:
+            artifact = getattr(downloaded, "path", None)
+            egg_info_cache = _get_egg_info_cache_dir(
+                ireq.link, subdir=subdir, artifact=artifact
+            )
+            if egg_info_cache is not None:
+                _restore_egg_info(egg_info_cache, ireq.source_dir, subdir=subdir)
         created = cls.create(
-            ireq.source_dir, subdirectory=subdir, ireq=ireq, kwargs=kwargs, stack=stack
+            ireq.source_dir,
+            subdirectory=subdir,
+            ireq=ireq,
+            kwargs=kwargs,
+            stack=stack,
+            egg_info_cache=egg_info_cache,
         )
+        if cache_key is not None and created is not None:
+            _SETUP_INFO_CACHE[cache_key] = created
         return created
 
+    @classmethod
+    def from_ireqs(cls, ireqs, finder=None, num_workers=None):
+        # type: (Sequence[InstallRequirement], Optional[PackageFinder], Optional[int]) -> Dict[S, SetupInfo]
+        """Gather setup info for several unrelated requirements in parallel.
+
+        Unpacking and running **setup.py** is CPU bound, so the requirements are
+        split across worker processes. Workers hand back plain metadata which is
+        loaded into a new :class:`SetupInfo` for each of the supplied
+        requirements, the unpacked sources stay with the workers.
+
+        :param ireqs: The install requirements to gather setup info for
+        :param finder: A package finder, only used when running in-process
+        :param num_workers: The number of worker processes, default ``os.cpu_count()``
+        :return: A mapping of project names to their setup info
+        :rtype: Dict[str, SetupInfo]
+        """
+        ireqs = [ireq for ireq in ireqs if ireq.link and not ireq.link.is_wheel]
+        num_workers = min(num_workers or os.cpu_count() or 1, len(ireqs))
+        if num_workers < 2:
+            results = {}
+            for ireq in ireqs:
+                subdir = ireq.link.subdirectory_fragment
+                setup_info = cls.from_ireq(ireq, subdir=subdir, finder=finder)
+                if setup_info is not None:
+                    setup_info.get_info()
+                    results[ireq.name or setup_info.name] = setup_info
+            return results
+        lines = [
+            (
+                ireq.link.url,
+                ireq.editable,
+                tuple(sorted(ireq.extras)),
+                dict(ireq.hash_options),
+            )
+            for ireq in ireqs
+        ]
+        chunks = [lines[i::num_workers] for i in range(num_workers)]
+        with ProcessPoolExecutor(
+            max_workers=num_workers, initializer=_init_setup_info_worker
+        ) as executor:
+            chunk_results = list(executor.map(_get_setup_info_dicts, chunks))
+        results = {}
+        for i, chunk_result in enumerate(chunk_results):
+            for ireq, info_dict in zip(ireqs[i::num_workers], chunk_result):
+                if info_dict is None:
+                    continue
+                setup_info = cls(
+                    name=info_dict["name"],
+                    build_backend=info_dict["build_backend"],
+                    build_requires=info_dict["build_requires"],
+                    python_requires=info_dict["python_requires"],
+                    ireq=ireq,
+                    # Already populated, there are no local sources to build from
+                    metadata=(),
+                    stack=ExitStack(),
+                )
+                setup_info.update_from_dict(info_dict)
+                results[ireq.name or setup_info.name] = setup_info
+        return results
+
     @classmethod
     def create(
         cls,
@@ -1537,6 +1992,7 @@ build-backend = "{1}"
         ireq=None,  # type: Optional[InstallRequirement]
         kwargs=None,  # type: Optional[Dict[str, str]]
         stack=None,  # type: Optional[ExitStack]
+        egg_info_cache=None,  # type: Optional[str]
     ):
         # type: (...) -> Optional[SetupInfo]
         if not base_dir or base_dir is None:
@@ -1555,11 +2011,21 @@ build-backend = "{1}"
         creation_kwargs["pyproject"] = pyproject
         creation_kwargs["setup_py"] = setup_py
         creation_kwargs["setup_cfg"] = setup_cfg
+        # One directory scan instead of a stat call per file, per lookup
+        setup_files = _list_file_names(setup_py.parent)
+        root_files = setup_files
+        if pyproject.parent != setup_py.parent:
+            root_files = _list_file_names(pyproject.parent)
+        creation_kwargs["has_setup_py"] = setup_py.name in setup_files
+        creation_kwargs["has_setup_cfg"] = setup_cfg.name in setup_files
+        creation_kwargs["has_pyproject"] = pyproject.name in root_files
         if stack is None:
             stack = ExitStack()
         creation_kwargs["stack"] = stack
         if ireq:
             creation_kwargs["ireq"] = ireq
+        if egg_info_cache:
+            creation_kwargs["egg_info_cache"] = egg_info_cache
         created = cls(**creation_kwargs)
         created.get_initial_info()
         return created
@@ -2,6 +2,7 @@ import logging
 import os
 import sys
 from collections.abc import ItemsView, Mapping, Sequence, Set
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import urlparse, urlsplit, urlunparse
 
@@ -665,6 +666,7 @@ def merge_items(target_list, sourced=False):
     return ret, source_map
 
 
+@lru_cache(maxsize=1)
 def get_pip_command() -> InstallCommand:
     # Use pip's parser for pip.conf management and defaults.
     # General options (find_links, index_url, extra_index_url, trusted_host,
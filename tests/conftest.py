@@ -115,6 +115,30 @@ def monkeypatch_if_needed(monkeypatch):
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_dependency_caches():
+    from requirementslib.models import dependencies
+
+    yield
+    dependencies.get_finder.cache_clear()
+    dependencies.AbstractDependency.clear_cache()
+    dependencies._NEGATIVE_CACHE.clear()
+    dependencies._SIMPLE_INDEX_METADATA_URLS.clear()
+    dependencies._JSON_API_RESPONSES.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_setup_info_caches():
+    from requirementslib.models import setup_info
+
+    yield
+    setup_info._SETUP_INFO_CACHE.clear()
+    setup_info._METADATA_CACHE.clear()
+    setup_info._SETUP_CFG_CACHE.clear()
+    setup_info._SETUP_CODE_CACHE.clear()
+    setup_info._PYPROJECT_CACHE.clear()
+
+
 @pytest.fixture(scope="session")
 def artifact_dir():
     return CURRENT_FILE.parent.joinpath("artifacts")
@@ -1,20 +1,310 @@
+import collections
+import os
+import subprocess
+import sys
+
 import pytest
+from pip._internal.models.candidate import InstallationCandidate
+from pip._internal.models.link import Link
 from pip._internal.req.constructors import (
     install_req_from_editable,
     install_req_from_line,
 )
 from pip._vendor.packaging.specifiers import SpecifierSet
+from pip._vendor.packaging.version import parse
 
+from requirementslib.models import dependencies
+from requirementslib.models.cache import DependencyCache
 from requirementslib.models.dependencies import (
     AbstractDependency,
     get_abstract_dependencies,
     get_dependencies,
     get_dependencies_from_index,
     get_dependencies_from_json,
+    get_finder,
+    get_grouped_dependencies,
 )
 from requirementslib.models.requirements import Requirement
 
 
+def test_get_finder_is_cached():
+    sources = [{"url": "https://pypi.org/simple", "name": "pypi", "verify_ssl": True}]
+    session, finder = get_finder()
+    assert get_finder(sources=sources) == (session, finder)
+    get_finder.cache_clear()
+    assert get_finder()[1] is not finder
+
+
+@pytest.fixture
+def fake_matches(monkeypatch):
+    calls = []
+
+    def find_all_matches(self, sources=None, finder=None):
+        calls.append(self.name)
+        return [
+            InstallationCandidate(
+                self.name,
+                version,
+                Link("https://example.com/{0}-{1}.{2}".format(self.name, version, ext)),
+            )
+            for version in ("1.0.0", "1.2.0", "1.1.0")
+            for ext in ("tar.gz", "zip")
+            if self.ireq.specifier.contains(version)
+        ]
+
+    monkeypatch.setattr(Requirement, "find_all_matches", find_all_matches)
+    yield calls
+
+
+def test_from_requirement_is_cached(fake_matches):
+    dep = AbstractDependency.from_requirement(Requirement.from_line("six>=1.0"))
+    assert [str(c.specifier) for c in dep.candidates] == [
+        "==1.0.0",
+        "==1.1.0",
+        "==1.2.0",
+    ]
+    other = AbstractDependency.from_requirement(Requirement.from_line("six>=1.0"))
+    assert fake_matches == ["six"]
+    assert other.candidates is not dep.candidates
+    assert other.dep_dict is not dep.dep_dict
+    AbstractDependency.from_requirement(Requirement.from_line("six>=1.1"))
+    assert fake_matches == ["six", "six"]
+
+
+def test_cached_candidates_are_not_shared(fake_matches):
+    first, second = get_abstract_dependencies(["attrs>=1.0", "idna>=1.0"])
+    dep = AbstractDependency.from_requirement(
+        Requirement.from_line("six>=1.0"), parent=first
+    )
+    dep.candidates[0].parent = "pinned-by-resolver"
+    other = AbstractDependency.from_requirement(
+        Requirement.from_line("six>=1.0"), parent=second
+    )
+    assert sorted(fake_matches) == ["attrs", "idna", "six"]
+    assert all(c.parent is second for c in other.candidates)
+    assert dep.candidates[1].parent is first
+    assert [str(c.specifier) for c in other.candidates] == [
+        str(c.specifier) for c in dep.candidates
+    ]
+
+
+def test_compatible_abstract_dep_keeps_candidate_deps(fake_matches):
+    dep1, dep2 = get_abstract_dependencies(["six>=1.0", "six<1.2"])
+    assert dep1.compatible_versions(dep2) == {parse("1.0.0"), parse("1.1.0")}
+    dep1.dep_dict[1] = ["fake-dependency"]
+    merged = dep1.compatible_abstract_dep(dep2)
+    assert [str(c.specifier) for c in merged.candidates] == ["==1.0.0", "==1.1.0"]
+    assert merged.dep_dict == [None, ["fake-dependency"]]
+    assert merged.get_deps(merged.candidates[1]) == ["fake-dependency"]
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("six", False),
+        ('six ; python_version >= "3.6"', False),
+        ('six ; platform_release == "extra"', False),
+        ('six ; extra == "socks"', True),
+        ('six ; "socks" == extra', True),
+        ('six ; python_version >= "3.6" and (os_name == "nt" or extra == "a")', True),
+    ],
+)
+def test_marker_contains_extra(line, expected):
+    assert dependencies._marker_contains_extra(install_req_from_line(line)) is expected
+
+
+def test_grouped_dependencies_do_not_modify_inputs():
+    ireqs = [
+        install_req_from_line(line)
+        for line in ("requests[socks]>=2.0", "six", "requests[security]<3.0")
+    ]
+    grouped = {ireq.name: ireq for ireq in get_grouped_dependencies(ireqs)}
+    assert set(grouped) == {"requests", "six"}
+    combined = grouped["requests"]
+    assert combined.specifier == SpecifierSet(">=2.0,<3.0")
+    assert combined.extras == ("security", "socks")
+    assert str(ireqs[0].specifier) == ">=2.0"
+    assert ireqs[0].extras == {"socks"}
+
+
+def test_abstract_deps_keep_input_order(fake_matches):
+    names = ["six", "attrs", "idna"]
+    abstract_deps = get_abstract_dependencies(["{0}>=1.0".format(n) for n in names])
+    assert [dep.name for dep in abstract_deps] == names
+    assert sorted(fake_matches) == sorted(names)
+
+
+def test_abstract_deps_from_named_requirement(fake_matches):
+    req = Requirement.from_line('six[extra]>=1.0 ; python_version >= "3.6"')
+    dep = get_abstract_dependencies([req])[0]
+    assert dep.requirement is not req
+    assert dep.requirement.extras == req.extras
+    assert str(dep.requirement.markers) == str(req.markers)
+    assert dep.specifiers == req.specifiers
+
+
+@pytest.mark.parametrize(
+    "line, index",
+    [
+        ("Django==3.2", None),
+        ("six==1.16.0 --hash=sha256:" + "0" * 64, None),
+        ("six>=1.0", "custom"),
+    ],
+)
+def test_abstract_deps_keep_name_index_and_hashes(fake_matches, line, index):
+    req = Requirement.from_line(line)
+    req.index = index
+    dep = get_abstract_dependencies([req])[0]
+    assert dep.requirement is not req
+    assert dep.requirement.name == req.name
+    assert dep.requirement.index == req.index
+    assert dep.requirement.hashes == req.hashes
+
+
+def test_dependency_cache_batches_writes(pathlib_tmpdir):
+    cache = DependencyCache(pathlib_tmpdir.as_posix())
+    ireqs = [install_req_from_line(line) for line in ("six==1.16.0", "idna==3.4")]
+    with cache.batch():
+        for ireq in ireqs:
+            cache[ireq] = []
+        assert not list(pathlib_tmpdir.iterdir())
+    cache_file = next(pathlib_tmpdir.iterdir())
+    assert cache_file.name.startswith("reqlib-depcache-py")
+    reloaded = DependencyCache(pathlib_tmpdir.as_posix())
+    assert all(ireq in reloaded for ireq in ireqs)
+
+
+def test_dependency_cache_stays_in_memory_by_default(pathlib_tmpdir, monkeypatch):
+    monkeypatch.chdir(pathlib_tmpdir.as_posix())
+    cache = DependencyCache()
+    with cache.batch():
+        cache[install_req_from_line("six==1.16.0")] = []
+    cache.flush()
+    assert not list(pathlib_tmpdir.iterdir())
+
+
+def test_dependency_cache_dir_is_opt_in(pathlib_tmpdir):
+    script = "\n".join(
+        [
+            "from pip._internal.req.constructors import install_req_from_line",
+            "from requirementslib.models.dependencies import DEPENDENCY_CACHE",
+            # Left open, so only the atexit hook can write the change out
+            "DEPENDENCY_CACHE.batch().__enter__()",
+            "DEPENDENCY_CACHE[install_req_from_line('six==1.16.0')] = []",
+        ]
+    )
+    env = dict(os.environ, REQUIREMENTSLIB_DEPENDENCY_CACHE_DIR=pathlib_tmpdir.as_posix())
+    subprocess.check_call([sys.executable, "-c", script], env=env)
+    cache_file = next(pathlib_tmpdir.iterdir())
+    assert cache_file.name.startswith("reqlib-depcache-py")
+    reloaded = DependencyCache(pathlib_tmpdir.as_posix())
+    assert install_req_from_line("six==1.16.0") in reloaded
+
+
+class FakeResponse(object):
+    def __init__(self, status_code, payload=None, etag=None, text=""):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = {"ETag": etag} if etag else {}
+        self.text = text
+
+    def json(self):
+        return self.payload
+
+    def close(self):
+        pass
+
+
+class FakeSession(object):
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def get(self, url, headers=None, stream=False):
+        self.sent_headers.append(headers)
+        return self.responses.pop(0)
+
+
+def test_json_api_info_revalidates_with_etag(monkeypatch):
+    monkeypatch.setattr(dependencies, "_JSON_API_RESPONSES", collections.OrderedDict())
+    info = {"requires_dist": ["idna"]}
+    session = FakeSession(
+        FakeResponse(200, {"info": info}, etag='"abc"'), FakeResponse(304)
+    )
+    url = "https://pypi.org/pypi/requests/2.19.1/json"
+    assert dependencies._get_json_api_info(session, url) == (info, 200)
+    assert dependencies._get_json_api_info(session, url) == (info, 304)
+    assert session.sent_headers == [None, {"If-None-Match": '"abc"'}]
+
+
+def test_json_api_misses_are_remembered(monkeypatch):
+    monkeypatch.setattr(dependencies, "_NEGATIVE_CACHE", set())
+    session = FakeSession(FakeResponse(404, {"message": "Not Found"}))
+    monkeypatch.setattr(dependencies, "_PYPI_SESSION", session)
+    ireq = install_req_from_line("not-a-real-package==1.0.0")
+    assert get_dependencies_from_json(ireq) is None
+    assert get_dependencies_from_json(ireq) is None
+    assert len(session.sent_headers) == 1
+
+
+@pytest.mark.parametrize("status_code", [429, 503])
+def test_json_api_transient_errors_are_not_remembered(monkeypatch, status_code):
+    session = FakeSession(
+        FakeResponse(status_code), FakeResponse(200, {"info": {"requires_dist": []}})
+    )
+    monkeypatch.setattr(dependencies, "_PYPI_SESSION", session)
+    monkeypatch.setattr(dependencies, "DEPENDENCY_CACHE", DependencyCache())
+    ireq = install_req_from_line("requests==2.19.1")
+    assert get_dependencies_from_json(ireq) is None
+    assert get_dependencies_from_json(ireq) == set()
+    assert not dependencies._NEGATIVE_CACHE
+
+
+def test_simple_index_outage_is_not_remembered(monkeypatch):
+    session = FakeSession(FakeResponse(503), FakeResponse(200, {"files": []}))
+    monkeypatch.setattr(dependencies, "_PYPI_SESSION", session)
+    ireq = install_req_from_line("requests==2.19.1")
+    assert dependencies.get_dependencies_from_simple_index(ireq) is None
+    assert not dependencies._SIMPLE_INDEX_METADATA_URLS
+    assert not dependencies._NEGATIVE_CACHE
+    assert dependencies.get_dependencies_from_simple_index(ireq) is None
+    assert dependencies._SIMPLE_INDEX_METADATA_URLS == {"requests": {}}
+    assert len(session.responses) == 0
+
+
+def test_get_deps_from_simple_index(monkeypatch):
+    monkeypatch.setattr(dependencies, "_SIMPLE_INDEX_METADATA_URLS", {})
+    monkeypatch.setattr(dependencies, "DEPENDENCY_CACHE", DependencyCache())
+    wheel_url = "https://files.example.com/requests-2.19.1-py2.py3-none-any.whl"
+    files = [
+        {"filename": "requests-2.19.1.tar.gz", "url": "https://files.example.com/sdist"},
+        {
+            "filename": wheel_url.rpartition("/")[-1],
+            "url": wheel_url,
+            "core-metadata": True,
+        },
+    ]
+    metadata = "\n".join(
+        [
+            "Metadata-Version: 2.1",
+            "Name: requests",
+            "Version: 2.19.1",
+            "Requires-Dist: idna (<2.8,>=2.5)",
+            'Requires-Dist: PySocks (>=1.5.6) ; extra == "socks"',
+            "",
+        ]
+    )
+    session = FakeSession(
+        FakeResponse(200, {"files": files}), FakeResponse(200, text=metadata)
+    )
+    monkeypatch.setattr(dependencies, "_PYPI_SESSION", session)
+    deps = dependencies.get_dependencies_from_simple_index(
+        install_req_from_line("requests==2.19.1")
+    )
+    assert deps == {"idna<2.8,>=2.5"}
+    assert session.sent_headers[0] == {"Accept": "application/vnd.pypi.simple.v1+json"}
+
+
 @pytest.mark.needs_internet
 def test_find_all_matches():
     r = Requirement.from_line("six")
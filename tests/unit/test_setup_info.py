@@ -1,13 +1,21 @@
 # -*- coding=utf-8 -*-
+import multiprocessing
 import os
 import shutil
+import sys
+from contextlib import ExitStack
 from pathlib import Path
 
+import attr
 import pytest
 import vistir
+from pip._internal.models.link import Link
+from pip._internal.req.constructors import install_req_from_line
+from pip._vendor.packaging.specifiers import SpecifierSet
 
+from requirementslib.models import setup_info
 from requirementslib.models.requirements import Requirement
-from requirementslib.models.setup_info import ast_parse_setup_py
+from requirementslib.models.setup_info import SetupInfo, SetupReader, ast_parse_setup_py
 
 
 @pytest.mark.skipif(os.name == "nt", reason="Building this is broken on windows")
@@ -285,3 +293,393 @@ def test_ast_parse_from_dict_with_name(setup_py_dir):
         (setup_py_dir / "package_with_setup_from_dict_with_name/setup.py").as_posix()
     )
     assert parsed["install_requires"] == ["requests"]
+
+
+def test_from_ireq_is_cached_by_link(monkeypatch, tmpdir):
+    url = "https://files.example.com/packages/sample-1.0.tar.gz"
+    first = install_req_from_line("{0}#egg=sample".format(url))
+    first.source_dir = tmpdir.strpath
+    cached = SetupInfo(
+        name="sample", base_dir=tmpdir.strpath, ireq=first, stack=ExitStack()
+    )
+    key = setup_info._get_setup_info_cache_key(first)
+    monkeypatch.setitem(setup_info._SETUP_INFO_CACHE, key, cached)
+    ireq = install_req_from_line("{0}#egg=sample".format(url))
+    result = SetupInfo.from_ireq(ireq)
+    assert result is not cached
+    assert result.name == "sample"
+    assert result.ireq is ireq
+    assert ireq.source_dir == tmpdir.strpath
+
+
+@pytest.mark.parametrize(
+    "line, hash_options",
+    [
+        ("{0}#egg=sample[extra]", None),
+        ("{0}#egg=sample&sha256=" + "0" * 64, None),
+        ("{0}#egg=sample", {"sha256": ["0" * 64]}),
+    ],
+)
+def test_from_ireq_cache_key_tracks_extras_and_hashes(line, hash_options):
+    url = "https://files.example.com/packages/sample-1.0.tar.gz"
+    plain = install_req_from_line("{0}#egg=sample".format(url))
+    other = install_req_from_line(line.format(url), hash_options=hash_options)
+    assert setup_info._get_setup_info_cache_key(
+        plain
+    ) != setup_info._get_setup_info_cache_key(other)
+
+
+def test_existing_egg_info_is_reused_while_fresh(tmpdir):
+    base_dir = Path(tmpdir.strpath)
+    setup_py = base_dir.joinpath("setup.py")
+    setup_py.write_text("from setuptools import setup\nsetup(name='sample')\n")
+    egg_info = base_dir.joinpath("reqlib-metadata", "sample.egg-info")
+    egg_info.mkdir(parents=True)
+    egg_info.joinpath("PKG-INFO").write_text(
+        "Metadata-Version: 2.1\nName: sample\nVersion: 1.0\n"
+    )
+    egg_info.joinpath("requires.txt").write_text("six\n")
+    info = SetupInfo(
+        name="sample",
+        base_dir=base_dir.as_posix(),
+        setup_py=setup_py,
+        setup_cfg=base_dir.joinpath("setup.cfg"),
+        pyproject=base_dir.joinpath("pyproject.toml"),
+        stack=ExitStack(),
+    )
+    generated = egg_info.joinpath("PKG-INFO").stat().st_mtime
+    os.utime(setup_py.as_posix(), (generated - 10, generated - 10))
+    metadata = info.get_existing_egg_metadata()
+    assert metadata["name"] == "sample"
+    assert {str(r) for r in metadata["requires"]} == {"six"}
+    assert attr.evolve(info, name=None).get_existing_egg_metadata() is None
+    os.utime(setup_py.as_posix(), (generated + 10, generated + 10))
+    assert info.get_existing_egg_metadata() is None
+
+
+def test_egg_info_cache_dir_is_keyed_on_content(tmpdir):
+    url = "https://files.example.com/packages/sample-1.0.tar.gz"
+    assert setup_info._get_egg_info_cache_dir(Link(url)) is None
+    hashed = setup_info._get_egg_info_cache_dir(Link(url + "#sha256=" + "0" * 64))
+    assert hashed is not None
+    artifact = Path(tmpdir.strpath).joinpath("sample-1.0.tar.gz")
+    artifact.write_bytes(b"first")
+    first = setup_info._get_egg_info_cache_dir(Link(url), artifact=artifact.as_posix())
+    artifact.write_bytes(b"second")
+    second = setup_info._get_egg_info_cache_dir(Link(url), artifact=artifact.as_posix())
+    assert len({hashed, first, second}) == 3
+
+
+def test_egg_info_cache_dir_is_per_interpreter(monkeypatch):
+    link = Link("https://files.example.com/packages/sample-1.0.tar.gz#sha256=" + "0" * 64)
+    current = setup_info._get_egg_info_cache_dir(link)
+    monkeypatch.setattr(setup_info.sysconfig, "get_platform", lambda: "other-platform")
+    assert setup_info._get_egg_info_cache_dir(link) != current
+
+
+def test_shipped_egg_info_is_not_reused(tmpdir):
+    base_dir = Path(tmpdir.strpath)
+    setup_py = base_dir.joinpath("setup.py")
+    setup_py.write_text("from setuptools import setup\nsetup(name='sample')\n")
+    shipped = base_dir.joinpath("sample.egg-info")
+    shipped.mkdir()
+    shipped.joinpath("PKG-INFO").write_text(
+        "Metadata-Version: 2.1\nName: sample\nVersion: 1.0\n"
+    )
+    shipped.joinpath("requires.txt").write_text("shipped-by-maintainer\n")
+    generated = shipped.joinpath("PKG-INFO").stat().st_mtime
+    os.utime(setup_py.as_posix(), (generated - 10, generated - 10))
+    info = SetupInfo(
+        name="sample",
+        base_dir=base_dir.as_posix(),
+        setup_py=setup_py,
+        stack=ExitStack(),
+    )
+    assert info.get_existing_egg_metadata() is None
+
+
+def test_store_egg_info_leaves_no_partial_entry(monkeypatch, tmpdir):
+    base_dir = Path(tmpdir.strpath)
+    egg_info = base_dir.joinpath("reqlib-metadata", "sample.egg-info")
+    egg_info.mkdir(parents=True)
+    egg_info.joinpath("PKG-INFO").write_text("Name: sample\n")
+    egg_info.joinpath("requires.txt").write_text("six\n")
+    cache_dir = base_dir.joinpath("cache", "entry")
+    info = SetupInfo(
+        name="sample",
+        base_dir=base_dir.as_posix(),
+        egg_info_cache=cache_dir.as_posix(),
+        stack=ExitStack(),
+    )
+
+    def fail_copy(src, dst):
+        os.makedirs(dst)
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(setup_info.shutil, "copytree", fail_copy)
+    info.store_egg_info()
+    assert not cache_dir.exists()
+    assert not list(cache_dir.parent.iterdir())
+    monkeypatch.undo()
+    info.store_egg_info()
+    restored = base_dir.joinpath("restored")
+    restored.joinpath("setup.py").parent.mkdir()
+    restored.joinpath("setup.py").write_text("")
+    setup_info._restore_egg_info(cache_dir.as_posix(), restored.as_posix())
+    restored_egg_info = restored.joinpath("reqlib-metadata", "sample.egg-info")
+    assert restored_egg_info.joinpath("requires.txt").read_text() == "six\n"
+
+
+def test_local_egg_metadata_is_not_stale(tmpdir):
+    metadata_dir = Path(tmpdir.strpath)
+    egg_info = metadata_dir.joinpath("sample.egg-info")
+    egg_info.mkdir()
+    egg_info.joinpath("PKG-INFO").write_text(
+        "Metadata-Version: 2.1\nName: sample\nVersion: 1.0\n"
+    )
+    egg_info.joinpath("requires.txt").write_text("six\n")
+    info = SetupInfo(name="sample", base_dir=metadata_dir.as_posix(), stack=ExitStack())
+    metadata = info.get_egg_metadata(metadata_dir=metadata_dir.as_posix())
+    assert {str(r) for r in metadata["requires"]} == {"six"}
+    egg_info.joinpath("requires.txt").write_text("attrs\n")
+    metadata = info.get_egg_metadata(metadata_dir=metadata_dir.as_posix())
+    assert {str(r) for r in metadata["requires"]} == {"attrs"}
+
+
+def test_cached_pyproject_is_reread_when_changed(tmpdir):
+    pyproject = Path(tmpdir.strpath).joinpath("pyproject.toml")
+    pyproject.write_text(
+        '[build-system]\nrequires = ["setuptools"]\n'
+        'build-backend = "setuptools.build_meta"\n'
+    )
+    requires, backend = setup_info._get_cached_pyproject(tmpdir.strpath)
+    assert backend == "setuptools.build_meta"
+    pyproject.write_text(
+        '[build-system]\nrequires = ["flit_core"]\nbuild-backend = "flit_core.buildapi"\n'
+    )
+    requires, backend = setup_info._get_cached_pyproject(tmpdir.strpath)
+    assert backend == "flit_core.buildapi"
+    assert requires == ["flit_core"]
+
+
+def test_read_setup_cfg(tmpdir):
+    setup_cfg = Path(tmpdir.strpath).joinpath("setup.cfg")
+    setup_cfg.write_text(
+        "[metadata]\n"
+        "name = sample-pkg\n"
+        "version: 1.2\n"
+        "\n"
+        "[options]\n"
+        "# python_requires = >=2.7\n"
+        "python_requires = >=3.7\n"
+        "install_requires =\n"
+        "    six>=1.0\n"
+        "\n"
+        "    requests[security]; python_version >= '3.6'\n"
+        "\n"
+        "[options.extras_require]\n"
+        "Tests =\n"
+        "    pytest\n"
+        "dev-tools = black\n"
+    )
+    assert SetupReader.read_setup_cfg(setup_cfg) == {
+        "name": "sample-pkg",
+        "version": "1.2",
+        "install_requires": ["six>=1.0", "requests[security]; python_version >= '3.6'"],
+        "extras_require": {"tests": ["pytest"], "dev-tools": ["black"]},
+        "python_requires": ">=3.7",
+    }
+
+
+def test_iter_metadata_skips_unrelated_dirs(tmpdir):
+    root = Path(tmpdir.strpath)
+    for metadata_dir in (
+        "sample.egg-info",
+        "src/other.egg-info",
+        "tests/fixture.egg-info",
+        ".tox/cached.egg-info",
+    ):
+        root.joinpath(metadata_dir).mkdir(parents=True)
+    found = sorted(entry.name for entry in setup_info.iter_metadata(root.as_posix()))
+    assert found == ["other.egg-info", "sample.egg-info"]
+    matches = list(setup_info.iter_metadata(root.as_posix(), pkg_name="other"))
+    assert [entry.name for entry in matches] == ["other.egg-info"]
+
+
+@pytest.mark.parametrize(
+    "pkg_name, metadata_dir",
+    [
+        ("zope.interface", "zope.interface-5.4.0.dist-info"),
+        ("Sample-Pkg", "sample_pkg-1.0.dist-info"),
+        ("sample_pkg", "sample-pkg.egg-info"),
+        ("sample-pkg", "sample_pkg-1.0-py3.8.egg-info"),
+    ],
+)
+def test_iter_metadata_matches_normalized_names(tmpdir, pkg_name, metadata_dir):
+    root = Path(tmpdir.strpath)
+    root.joinpath("sample_pkg_extra-1.0.dist-info").mkdir()
+    root.joinpath(metadata_dir).mkdir()
+    metadata_type = metadata_dir.rpartition(".")[-1]
+    matches = setup_info.iter_metadata(
+        root.as_posix(), pkg_name=pkg_name, metadata_type=metadata_type
+    )
+    assert [entry.name for entry in matches] == [metadata_dir]
+
+
+def test_parse_setup_cfg_is_cached_until_modified(monkeypatch, tmpdir):
+    setup_cfg = Path(tmpdir.strpath).joinpath("setup.cfg")
+    setup_cfg.write_text("[metadata]\nname = sample\n")
+    calls = []
+
+    def fake_parse(path):
+        calls.append(path)
+        return {"name": "sample"}
+
+    monkeypatch.setattr(setup_info, "setuptools_parse_setup_cfg", fake_parse)
+    info = SetupInfo(setup_cfg=setup_cfg, stack=ExitStack())
+    assert info.parse_setup_cfg() == {"name": "sample"}
+    assert info.parse_setup_cfg() == {"name": "sample"}
+    assert len(calls) == 1
+    setup_cfg.write_text("[metadata]\nname = sample-renamed\n")
+    info.parse_setup_cfg()
+    assert len(calls) == 2
+
+
+def fake_setup_info_from_ireq(cls, ireq, subdir=None, finder=None, session=None):
+    name = ireq.link.egg_fragment
+    info = cls(
+        name=name,
+        build_backend="setuptools.build_meta",
+        build_requires=("setuptools>=40.8", "wheel"),
+        python_requires=SpecifierSet(">=3.7"),
+        ireq=ireq,
+        stack=ExitStack(),
+        metadata=(),
+    )
+    info.update_from_dict(
+        {
+            "version": "1.0",
+            "install_requires": ["{0}-dep>=1.0".format(name)],
+            "setup_requires": ["setuptools_scm"],
+            "extras_require": {"tests": ["pytest"]},
+        }
+    )
+    return info
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="Workers need to inherit the patched from_ireq",
+)
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_from_ireqs(monkeypatch, num_workers):
+    monkeypatch.setattr(SetupInfo, "from_ireq", classmethod(fake_setup_info_from_ireq))
+    ireqs = [
+        install_req_from_line(
+            "https://files.example.com/{0}-1.0.tar.gz#egg={0}".format(name)
+        )
+        for name in ("alpha", "beta", "gamma")
+    ]
+    ireqs.append(install_req_from_line("six==1.16.0"))
+    results = SetupInfo.from_ireqs(ireqs, num_workers=num_workers)
+    assert sorted(results) == ["alpha", "beta", "gamma"]
+    for name, info in results.items():
+        assert info.name == name
+        assert info.version == "1.0"
+        assert sorted(info.requires) == ["{0}-dep".format(name)]
+        assert sorted(info.extras) == ["tests"]
+        assert info.ireq.link.egg_fragment == name
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="Workers need to inherit the patched from_ireq",
+)
+def test_from_ireqs_parallel_matches_serial(monkeypatch):
+    monkeypatch.setattr(SetupInfo, "from_ireq", classmethod(fake_setup_info_from_ireq))
+    ireqs = [
+        install_req_from_line(
+            "https://files.example.com/{0}-1.0.tar.gz#egg={0}".format(name)
+        )
+        for name in ("alpha", "beta", "gamma")
+    ]
+    serial = SetupInfo.from_ireqs(ireqs, num_workers=1)
+    parallel = SetupInfo.from_ireqs(ireqs, num_workers=2)
+    assert sorted(parallel) == sorted(serial)
+    for name, expected in serial.items():
+        info = parallel[name]
+        assert info.name == expected.name
+        assert info.version == expected.version
+        assert info.requires == expected.requires
+        assert sorted(str(e) for e in info.extras) == sorted(
+            str(e) for e in expected.extras
+        )
+        assert info.python_requires == expected.python_requires
+        assert type(info.python_requires) is type(expected.python_requires)
+        assert info.setup_requires == expected.setup_requires
+        assert info.build_requires == expected.build_requires
+        assert info.build_backend == expected.build_backend
+
+
+def test_setup_info_worker_keeps_hash_options(monkeypatch):
+    seen = []
+
+    def from_ireq(cls, ireq, subdir=None, finder=None, session=None):
+        seen.append(ireq.hashes(True))
+        return fake_setup_info_from_ireq(cls, ireq, subdir=subdir)
+
+    monkeypatch.setattr(SetupInfo, "from_ireq", classmethod(from_ireq))
+    url = "https://files.example.com/alpha-1.0.tar.gz#egg=alpha"
+    hash_options = {"sha256": ["0" * 64]}
+    results = setup_info._get_setup_info_dicts([(url, False, (), hash_options)])
+    assert results[0]["name"] == "alpha"
+    assert seen[0].is_hash_allowed("sha256", "0" * 64)
+    assert not seen[0].is_hash_allowed("sha256", "1" * 64)
+
+
+class FakePipCommand(object):
+    def __init__(self):
+        self.parser = self
+
+    def parse_args(self, args):
+        return None, args
+
+    def _build_session(self, options):
+        return FakePipSession()
+
+
+class FakePipSession(object):
+    def close(self):
+        pass
+
+
+def test_setup_info_worker_builds_its_own_session(monkeypatch):
+    monkeypatch.setattr(setup_info, "get_pip_command", FakePipCommand)
+    setup_info._get_default_session.cache_clear()
+    inherited = setup_info._get_default_session()
+    setup_info._init_setup_info_worker()
+    assert setup_info._get_default_session() is not inherited
+    setup_info._get_default_session.cache_clear()
+
+
+def test_run_setup_restores_argv(tmpdir):
+    setup_py = Path(tmpdir.strpath).joinpath("setup.py")
+    setup_py.write_text("import sys\nopen('argv.txt', 'w').write(' '.join(sys.argv))\n")
+    egg_base = Path(tmpdir.strpath).joinpath("reqlib-metadata")
+    egg_base.mkdir()
+    argv = sys.argv
+    saved = list(argv)
+    setup_info.run_setup(setup_py.as_posix(), egg_base=egg_base.as_posix())
+    assert sys.argv is argv
+    assert sys.argv == saved
+    written = Path(tmpdir.strpath).joinpath("argv.txt").read_text()
+    assert written == "setup.py egg_info --egg-base {0}".format(egg_base.as_posix())
+
+
+def test_compiled_setup_py_is_reused_until_modified(tmpdir):
+    setup_py = Path(tmpdir.strpath).joinpath("setup.py")
+    setup_py.write_text("name = 'sample'\r\n")
+    code = setup_info._compile_setup_py(setup_py.as_posix(), "setup.py")
+    assert setup_info._compile_setup_py(setup_py.as_posix(), "setup.py") is code
+    setup_py.write_text("name = 'sample-renamed'\n")
+    assert setup_info._compile_setup_py(setup_py.as_posix(), "setup.py") is not code